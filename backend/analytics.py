@@ -3,10 +3,12 @@ Advanced Analytics Module
 Market trends, industry analysis, and insights
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from models import Job, Company, Salary, Skill, JobSkill, Industry, JobIndustry, Benefit
+from sqlalchemy import func, desc, and_, or_, case, cast, Integer
+from models import Job, Company, Salary, Skill, JobSkill, Industry, JobIndustry, Benefit, SkillCooccurrence
 from typing import List, Dict, Optional
+from cache import memoize
 import pandas as pd
+import math
 
 
 class MarketAnalytics:
@@ -25,15 +27,16 @@ class MarketAnalytics:
             "industries": self._get_industry_stats()
         }
     
+    @memoize(ttl=300)
     def get_industry_breakdown(self, limit: int = 20) -> List[Dict]:
         """Get job distribution by industry"""
         # Since JobIndustry table is empty, use Skill names as proxy for "industries"
         # Or use job titles to infer industries
         results = self.db.query(
-            Skill.skill_name,
+            JobSkill.skill_name,
             func.count(JobSkill.job_id).label('job_count')
-        ).join(JobSkill)\
-         .group_by(Skill.skill_name)\
+        ).filter(JobSkill.skill_name.isnot(None))\
+         .group_by(JobSkill.skill_name)\
          .order_by(desc('job_count'))\
          .limit(limit).all()
         
@@ -50,9 +53,6 @@ class MarketAnalytics:
     
     def get_location_insights(self, limit: int = 20) -> List[Dict]:
         """Get job market insights by location"""
-        # Parse state from location field
-        from sqlalchemy import case
-        
         # Extract state (assuming format "City, State")
         locations = self.db.query(
             Job.location,
@@ -62,47 +62,35 @@ class MarketAnalytics:
          .filter(Job.location.isnot(None))\
          .group_by(Job.location)\
          .order_by(desc('job_count'))\
-         .limit(limit * 2).all()  # Get more to aggregate by state
-        
-        # Aggregate by state
-        state_data = {}
-        for location, job_count, avg_salary in locations:
-            if ',' in location:
-                state = location.split(',')[-1].strip()
-            else:
-                state = location
-            
-            if state not in state_data:
-                state_data[state] = {
-                    'job_count': 0,
-                    'salaries': [],
-                    'cities': []
-                }
-            
-            state_data[state]['job_count'] += job_count
-            if avg_salary:
-                state_data[state]['salaries'].append(avg_salary)
-            city = location.split(',')[0].strip() if ',' in location else location
-            state_data[state]['cities'].append((city, job_count))
+         .limit(limit * 2)  # Get more to aggregate by state
+        
+        df = pd.read_sql(locations.statement, self.db.connection())
+        
+        if df.empty:
+            return []
+        
+        # Split "City, State" in one vectorized pass
+        df['state'] = df['location'].str.rsplit(',', n=1).str[-1].str.strip()
+        df['city'] = df['location'].str.split(',', n=1).str[0].str.strip()
+        
+        # Aggregate by state (rows are already ordered by job_count desc)
+        by_state = df.groupby('state', sort=False).agg(
+            job_count=('job_count', 'sum'),
+            avg_salary=('avg_salary', 'mean')
+        )
+        by_state['top_city'] = df.drop_duplicates('state').set_index('state')['city']
+        by_state = by_state.nlargest(limit, 'job_count', keep='first')
         
         # Format results
-        results = []
-        for state, data in sorted(state_data.items(), key=lambda x: x[1]['job_count'], reverse=True)[:limit]:
-            avg_sal = sum(data['salaries']) / len(data['salaries']) if data['salaries'] else None
-            top_city = max(data['cities'], key=lambda x: x[1])[0] if data['cities'] else None
-            
-            results.append({
-                "state": state,
-                "job_count": data['job_count'],
-                "avg_salary": round(avg_sal, 2) if avg_sal else None,
-                "top_city": top_city
-            })
+        avg_salary = by_state['avg_salary'].round(2)
+        by_state['avg_salary'] = avg_salary.astype(object).where(avg_salary.notna(), None)
         
-        return results
+        return by_state.reset_index()[
+            ['state', 'job_count', 'avg_salary', 'top_city']
+        ].to_dict(orient='records')
     
     def get_city_rankings(self, limit: int = 30) -> List[Dict]:
         """Get top cities by job opportunities"""
-        # Parse location field (format: "City, State")
         cities = self.db.query(
             Job.location,
             func.count(Job.id).label('job_count'),
@@ -113,10 +101,12 @@ class MarketAnalytics:
          .order_by(desc('job_count'))\
          .limit(limit).all()
         
+        # Parse location field (format: "City, State") - only `limit` rows, first
+        # segment is the city, last segment the state
         return [
             {
-                "city": location.split(',')[0].strip() if ',' in location else location,
-                "state": location.split(',')[-1].strip() if ',' in location else '',
+                "city": location.partition(',')[0].strip() if ',' in location else location,
+                "state": location.rpartition(',')[2].strip() if ',' in location else '',
                 "job_count": job_count,
                 "avg_salary": round(avg_salary, 2) if avg_salary else None,
                 "location": location
@@ -126,33 +116,21 @@ class MarketAnalytics:
     
     def get_skill_co_occurrence(self, skill_name: str, limit: int = 10) -> List[Dict]:
         """Find skills that commonly appear together with given skill"""
-        # Find jobs that require this skill
-        target_skill = self.db.query(Skill).filter(
-            Skill.skill_name == skill_name
-        ).first()
-        
-        if not target_skill:
-            return []
-        
-        # Get job_ids with this skill
-        job_ids = self.db.query(JobSkill.job_id).filter(
-            JobSkill.skill_abr == target_skill.skill_abr
-        ).subquery()
-        
-        # Find other skills in those jobs
+        # Pair counts are materialized by the ETL - an index range read
         co_occurring = self.db.query(
-            Skill.skill_name,
-            func.count(JobSkill.id).label('count')
-        ).join(JobSkill)\
-         .filter(JobSkill.job_id.in_(job_ids))\
-         .filter(Skill.skill_name != skill_name)\
-         .group_by(Skill.skill_name)\
-         .order_by(desc('count'))\
+            SkillCooccurrence.skill_b,
+            SkillCooccurrence.job_count
+        ).filter(SkillCooccurrence.skill_a == skill_name)\
+         .order_by(desc(SkillCooccurrence.job_count))\
          .limit(limit).all()
         
-        total = len(self.db.query(JobSkill.job_id).filter(
-            JobSkill.skill_abr == target_skill.skill_abr
-        ).distinct().all())
+        if not co_occurring:
+            return []
+        
+        # Jobs that require this skill (precomputed on the skill row)
+        total = self.db.query(func.sum(Skill.cached_job_count)).filter(
+            Skill.skill_name == skill_name
+        ).scalar() or 0
         
         return [
             {
@@ -165,34 +143,51 @@ class MarketAnalytics:
     
     def get_skill_network(self, min_co_occurrence: int = 5) -> Dict:
         """Build skill relationship network"""
-        # Get top skills
-        top_skills = self.db.query(Skill.skill_name).join(JobSkill)\
-            .group_by(Skill.id)\
-            .having(func.count(JobSkill.id) >= min_co_occurrence)\
-            .order_by(desc(func.count(JobSkill.id)))\
+        # Get top skills - an index read of the precomputed job counts
+        top_skills = self.db.query(Skill.skill_name)\
+            .filter(Skill.cached_job_count >= min_co_occurrence)\
+            .order_by(desc(Skill.cached_job_count))\
             .limit(20).all()
         
         skills = [s[0] for s in top_skills]
         
-        # Build adjacency matrix
-        edges = []
-        for skill in skills:
-            co_occurring = self.get_skill_co_occurrence(skill, limit=5)
-            for co_skill in co_occurring:
-                if co_skill['skill'] in skills:
-                    edges.append({
-                        "source": skill,
-                        "target": co_skill['skill'],
-                        "weight": co_skill['co_occurrence_count']
-                    })
+        if not skills:
+            return {"nodes": [], "edges": []}
+        
+        # Pairs among the top skills from the materialized table (each pair once)
+        pairs = self.db.query(
+            SkillCooccurrence.skill_a,
+            SkillCooccurrence.skill_b,
+            SkillCooccurrence.job_count
+        ).filter(SkillCooccurrence.skill_a.in_(skills))\
+         .filter(SkillCooccurrence.skill_b.in_(skills))\
+         .filter(SkillCooccurrence.skill_a < SkillCooccurrence.skill_b)\
+         .filter(SkillCooccurrence.job_count >= min_co_occurrence)\
+         .order_by(desc(SkillCooccurrence.job_count)).all()
+        
+        edges = [
+            {
+                "source": source,
+                "target": target,
+                "weight": weight
+            }
+            for source, target, weight in pairs
+        ]
         
         return {
             "nodes": [{"id": skill, "label": skill} for skill in skills],
             "edges": edges
         }
     
+    @memoize(ttl=300)
     def get_benefits_analysis(self) -> Dict:
         """Analyze benefits offerings"""
+        # Totals in one scan
+        total_benefits, total_jobs_with_benefits = self.db.query(
+            func.count(Benefit.id),
+            func.count(func.distinct(Benefit.job_id))
+        ).one()
+        
         # Top benefits
         top_benefits = self.db.query(
             Benefit.type,
@@ -201,10 +196,6 @@ class MarketAnalytics:
          .order_by(desc('count'))\
          .limit(20).all()
         
-        total_jobs_with_benefits = self.db.query(
-            func.count(func.distinct(Benefit.job_id))
-        ).scalar()
-        
         return {
             "top_benefits": [
                 {
@@ -216,12 +207,13 @@ class MarketAnalytics:
             ],
             "total_jobs_with_benefits": total_jobs_with_benefits,
             "average_benefits_per_job": round(
-                self.db.query(func.count(Benefit.id)).scalar() / total_jobs_with_benefits, 2
+                total_benefits / total_jobs_with_benefits, 2
             ) if total_jobs_with_benefits > 0 else 0
         }
     
     def get_company_insights(self, limit: int = 20) -> List[Dict]:
         """Get insights about top hiring companies"""
+        # Select only the reported columns - description/url/address are never loaded
         companies = self.db.query(
             Company.name,
             Company.company_size,
@@ -229,7 +221,7 @@ class MarketAnalytics:
             Company.state,
             func.count(Job.id).label('job_count'),
             func.avg(Salary.med_salary).label('avg_salary')
-        ).join(Job, Company.company_id == str(Job.company_id))\
+        ).join(Job, Company.company_id == Job.company_id)\
          .outerjoin(Salary, Job.job_id == Salary.job_id)\
          .group_by(Company.id)\
          .order_by(desc('job_count'))\
@@ -253,87 +245,108 @@ class MarketAnalytics:
         bins: int = 10
     ) -> Dict:
         """Get salary distribution (histogram data)"""
-        query = self.db.query(Salary.med_salary).filter(
-            Salary.med_salary.isnot(None)
-        )
-        
-        if skill_name:
-            query = query.join(Job).join(JobSkill).join(Skill).filter(
-                Skill.skill_name == skill_name
-            )
-        
-        salaries = [s[0] for s in query.all() if s[0]]
-        
-        if not salaries:
+        # Summary statistics in a single aggregate row
+        total, mean, minimum, maximum, sum_sq = self._salary_query(
+            skill_name,
+            func.count(Salary.med_salary),
+            func.avg(Salary.med_salary),
+            func.min(Salary.med_salary),
+            func.max(Salary.med_salary),
+            func.sum(Salary.med_salary * Salary.med_salary)
+        ).one()
+        
+        if not total:
             return {"error": "No salary data available"}
         
-        # Calculate statistics
-        salaries_array = pd.Series(salaries)
+        # Sample standard deviation (ddof=1) from the running sums
+        std = math.sqrt(max(0.0, (sum_sq - total * mean * mean) / (total - 1))) if total > 1 else 0.0
+        
+        # Create bins - widen a zero-width range the way pd.cut does
+        low, high = minimum, maximum
+        if low == high:
+            spread = abs(low) * 0.001 or 1.0
+            low, high = low - spread, high + spread
+        step = (high - low) / bins
         
-        # Create bins
-        hist, bin_edges = pd.cut(salaries_array, bins=bins, retbins=True)
-        value_counts = hist.value_counts().sort_index()
+        # Bucket each salary in SQL so only one row per bin is transferred
+        bucket = case(
+            (Salary.med_salary >= high, bins - 1),
+            else_=cast((Salary.med_salary - low) / step, Integer)
+        ).label('bucket')
+        counts = dict(self._salary_query(skill_name, bucket, func.count()).group_by(bucket).all())
         
         distribution = []
-        for interval, count in value_counts.items():
+        for i in range(bins):
+            count = counts.get(i, 0)
             distribution.append({
-                "range": f"${int(interval.left):,} - ${int(interval.right):,}",
-                "count": int(count),
-                "percentage": round((count / len(salaries) * 100), 2)
+                "range": f"${int(low + i * step):,} - ${int(low + (i + 1) * step):,}",
+                "count": count,
+                "percentage": round((count / total * 100), 2)
             })
         
         return {
             "distribution": distribution,
             "statistics": {
-                "mean": round(salaries_array.mean(), 2),
-                "median": round(salaries_array.median(), 2),
-                "std": round(salaries_array.std(), 2),
-                "min": round(salaries_array.min(), 2),
-                "max": round(salaries_array.max(), 2),
-                "q25": round(salaries_array.quantile(0.25), 2),
-                "q75": round(salaries_array.quantile(0.75), 2)
+                "mean": round(mean, 2),
+                "median": round(self._salary_quantile(skill_name, 0.5, total), 2),
+                "std": round(std, 2),
+                "min": round(minimum, 2),
+                "max": round(maximum, 2),
+                "q25": round(self._salary_quantile(skill_name, 0.25, total), 2),
+                "q75": round(self._salary_quantile(skill_name, 0.75, total), 2)
             },
-            "total_samples": len(salaries)
+            "total_samples": total
         }
     
     def compare_skills(self, skill_names: List[str]) -> Dict:
         """Compare multiple skills across various metrics"""
-        results = []
+        # Job count and average salary for every requested skill at once
+        metrics = self.db.query(
+            Skill.skill_name,
+            func.count(func.distinct(JobSkill.id)).label('job_count'),
+            func.avg(Salary.med_salary).label('avg_salary')
+        ).select_from(Skill)\
+         .outerjoin(JobSkill, Skill.id == JobSkill.skill_id)\
+         .outerjoin(Job, Job.job_id == JobSkill.job_id)\
+         .outerjoin(Salary, Salary.job_id == Job.job_id)\
+         .filter(Skill.skill_name.in_(skill_names))\
+         .group_by(Skill.skill_name).all()
+        
+        # Top industry per skill, ranked server-side
+        industry_ranks = self.db.query(
+            Skill.skill_name.label('skill_name'),
+            Industry.industry_name.label('industry_name'),
+            func.row_number().over(
+                partition_by=Skill.skill_name,
+                order_by=desc(func.count(JobIndustry.id))
+            ).label('rank')
+        ).select_from(Skill)\
+         .join(JobSkill, Skill.id == JobSkill.skill_id)\
+         .join(Job, Job.job_id == JobSkill.job_id)\
+         .join(JobIndustry, JobIndustry.job_id == Job.job_id)\
+         .join(Industry, Industry.industry_id == JobIndustry.industry_id)\
+         .filter(Skill.skill_name.in_(skill_names))\
+         .group_by(Skill.skill_name, Industry.industry_name)\
+         .subquery()
+        
+        top_industries = dict(
+            self.db.query(industry_ranks.c.skill_name, industry_ranks.c.industry_name)
+            .filter(industry_ranks.c.rank == 1).all()
+        )
+        
+        by_name = {name: (job_count, avg_salary) for name, job_count, avg_salary in metrics}
         
+        results = []
         for skill_name in skill_names:
-            skill = self.db.query(Skill).filter(
-                Skill.skill_name == skill_name
-            ).first()
-            
-            if not skill:
+            if skill_name not in by_name:
                 continue
             
-            # Job count
-            job_count = self.db.query(func.count(JobSkill.id)).filter(
-                JobSkill.skill_abr == skill.skill_abr
-            ).scalar()
-            
-            # Average salary
-            avg_salary = self.db.query(func.avg(Salary.med_salary))\
-                .join(Job).join(JobSkill)\
-                .filter(JobSkill.skill_abr == skill.skill_abr)\
-                .filter(Salary.med_salary.isnot(None)).scalar()
-            
-            # Top industries
-            top_industry = self.db.query(
-                Industry.industry_name,
-                func.count(JobIndustry.id).label('count')
-            ).join(JobIndustry).join(Job).join(JobSkill)\
-             .filter(JobSkill.skill_abr == skill.skill_abr)\
-             .group_by(Industry.industry_name)\
-             .order_by(desc('count'))\
-             .first()
-            
+            job_count, avg_salary = by_name[skill_name]
             results.append({
                 "skill": skill_name,
                 "job_count": job_count,
                 "avg_salary": round(avg_salary, 2) if avg_salary else None,
-                "top_industry": top_industry[0] if top_industry else None
+                "top_industry": top_industries.get(skill_name)
             })
         
         return {
@@ -345,10 +358,43 @@ class MarketAnalytics:
     # Private Helper Methods
     # ========================================
     
+    def _salary_query(self, skill_name: Optional[str], *columns):
+        """Query over non-null, non-zero median salaries, optionally limited to one skill"""
+        query = self.db.query(*columns).select_from(Salary).filter(
+            Salary.med_salary.isnot(None),
+            Salary.med_salary != 0
+        )
+        
+        if skill_name:
+            query = query.join(Job, Salary.job_id == Job.job_id)\
+                .join(JobSkill, Job.job_id == JobSkill.job_id)\
+                .join(Skill, JobSkill.skill_id == Skill.id)\
+                .filter(Skill.skill_name == skill_name)
+        
+        return query
+    
+    def _salary_quantile(self, skill_name: Optional[str], q: float, total: int) -> float:
+        """Linearly interpolated quantile (same as pandas) fetching only two rows"""
+        position = q * (total - 1)
+        lower = int(position)
+        values = [
+            v for (v,) in self._salary_query(skill_name, Salary.med_salary)
+            .order_by(Salary.med_salary)
+            .offset(lower).limit(2).all()
+        ]
+        
+        if len(values) == 1:
+            return values[0]
+        
+        return values[0] + (values[1] - values[0]) * (position - lower)
+    
+    @memoize(ttl=300)
     def _get_job_stats(self) -> Dict:
         """Get job statistics"""
-        total = self.db.query(func.count(Job.id)).scalar()
-        active = self.db.query(func.count(Job.id)).filter(Job.is_active == True).scalar()
+        total, active = self.db.query(
+            func.count(Job.id),
+            func.count(case((Job.is_active == True, Job.id)))
+        ).one()
         
         return {
             "total": total,
@@ -356,6 +402,7 @@ class MarketAnalytics:
             "inactive": total - active
         }
     
+    @memoize(ttl=300)
     def _get_company_stats(self) -> Dict:
         """Get company statistics"""
         total = self.db.query(func.count(Company.id)).scalar()
@@ -369,15 +416,17 @@ class MarketAnalytics:
             "currently_hiring": hiring
         }
     
+    @memoize(ttl=300)
     def _get_skill_stats(self) -> Dict:
         """Get skill statistics"""
         total = self.db.query(func.count(Skill.id)).scalar()
         
         # Most in-demand
         top_skill = self.db.query(
-            Skill.skill_name,
+            JobSkill.skill_name,
             func.count(JobSkill.id).label('count')
-        ).join(JobSkill).group_by(Skill.id)\
+        ).filter(JobSkill.skill_name.isnot(None))\
+         .group_by(JobSkill.skill_id, JobSkill.skill_name)\
          .order_by(desc('count')).first()
         
         return {
@@ -386,6 +435,7 @@ class MarketAnalytics:
             "demand_count": top_skill[1] if top_skill else 0
         }
     
+    @memoize(ttl=300)
     def _get_salary_stats(self) -> Dict:
         """Get salary statistics"""
         stats = self.db.query(
@@ -400,6 +450,7 @@ class MarketAnalytics:
             "maximum": round(stats[2], 2) if stats[2] else None
         }
     
+    @memoize(ttl=300)
     def _get_industry_stats(self) -> Dict:
         """Get industry statistics"""
         total = self.db.query(func.count(Industry.id)).scalar()
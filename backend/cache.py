@@ -0,0 +1,117 @@
+"""
+In-process Cache
+Memoize read-only aggregate results - the tables only change during ETL
+"""
+from collections import OrderedDict
+from threading import Lock
+import functools
+import inspect
+import time
+from database import get_data_version
+
+# Bumped by invalidate_cache(); part of every key so stale entries are never hit
+_DATA_VERSION = 0
+
+_cache = OrderedDict()
+_lock = Lock()
+MAX_ENTRIES = 512
+
+# The ETL runs in its own process, so lookups re-read the database's data
+# version (at most this often, in seconds) and drop everything when it moves
+VERSION_CHECK_INTERVAL = 5
+_version_checked_at = float('-inf')
+_db_version = None
+
+
+def invalidate_cache():
+    """Drop every cached result (call after the data changes in this process)"""
+    global _DATA_VERSION
+    with _lock:
+        _DATA_VERSION += 1
+        _cache.clear()
+
+
+def _sync_data_version():
+    """Invalidate the cache if another process has bumped the data version"""
+    global _version_checked_at, _db_version
+    now = time.monotonic()
+    if now < _version_checked_at + VERSION_CHECK_INTERVAL:
+        return
+    _version_checked_at = now
+    version = get_data_version()
+    if version != _db_version:
+        if _db_version is not None:
+            invalidate_cache()
+        _db_version = version
+
+
+def memoize(ttl: int = 300):
+    """
+    Cache a function's result for `ttl` seconds, LRU-evicted past MAX_ENTRIES.
+
+    The first argument (`self` or a DB session) is not part of the key, so
+    results are shared across requests; the rest of the arguments are. It may
+    also be passed by keyword, as FastAPI does with `db` when a route is
+    decorated directly (declare `db` first on such routes).
+
+    `fn.lookup(*args, **kwargs)` returns (hit, value) and `fn.store(value, *args,
+    **kwargs)` fills an entry, for callers that compute misses elsewhere
+    (e.g. in worker processes). Both take the arguments without `first`.
+    Coroutine functions are supported - the awaited result is cached.
+    """
+    def decorator(fn):
+        first_name = fn.__code__.co_varnames[0]
+
+        def make_key(args, kwargs):
+            return (fn.__qualname__, args, tuple(sorted(kwargs.items())), _DATA_VERSION)
+
+        def lookup(*args, **kwargs):
+            _sync_data_version()
+            key = make_key(args, kwargs)
+            with _lock:
+                entry = _cache.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    _cache.move_to_end(key)
+                    return True, entry[1]
+            return False, None
+
+        def store(result, *args, **kwargs):
+            key = make_key(args, kwargs)
+            with _lock:
+                _cache[key] = (time.monotonic() + ttl, result)
+                _cache.move_to_end(key)
+                while len(_cache) > MAX_ENTRIES:
+                    _cache.popitem(last=False)
+
+        def split_first(args, kwargs):
+            if args:
+                return args[0], args[1:]
+            return kwargs.pop(first_name), args
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                first, args = split_first(args, kwargs)
+                hit, result = lookup(*args, **kwargs)
+                if hit:
+                    return result
+
+                result = await fn(first, *args, **kwargs)
+                store(result, *args, **kwargs)
+                return result
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                first, args = split_first(args, kwargs)
+                hit, result = lookup(*args, **kwargs)
+                if hit:
+                    return result
+
+                result = fn(first, *args, **kwargs)
+                store(result, *args, **kwargs)
+                return result
+
+        wrapper.lookup = lookup
+        wrapper.store = store
+        return wrapper
+    return decorator
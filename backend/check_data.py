@@ -1,9 +1,17 @@
 from database import SessionLocal
 from models import Job, Industry, JobIndustry, Company
-from sqlalchemy import func
+from sqlalchemy import func, text
 
 db = SessionLocal()
 
+# All table counts in one round trip
+counts = db.execute(text("""
+    SELECT
+        (SELECT COUNT(*) FROM jobs WHERE location IS NOT NULL) AS jobs_with_location,
+        (SELECT COUNT(*) FROM industries) AS total_industries,
+        (SELECT COUNT(*) FROM job_industries) AS total_job_industries
+""")).one()
+
 # Check Job columns
 job = db.query(Job).first()
 print("=== Sample Job Data ===")
@@ -15,8 +23,7 @@ print(f"state: {job.state if hasattr(job, 'state') else 'N/A'}")
 print(f"company_id: {job.company_id}")
 
 # Check if location field has data
-jobs_with_location = db.query(Job).filter(Job.location.isnot(None)).count() if hasattr(Job, 'location') else 0
-print(f"\nJobs with location: {jobs_with_location}")
+print(f"\nJobs with location: {counts.jobs_with_location}")
 
 # Check Company data
 company = db.query(Company).first()
@@ -28,8 +35,8 @@ print(f"state: {company.state if hasattr(company, 'state') else 'N/A'}")
 
 # Check Industry data
 print("\n=== Industry Data ===")
-print(f"Total industries: {db.query(Industry).count()}")
-print(f"Total job-industry links: {db.query(JobIndustry).count()}")
+print(f"Total industries: {counts.total_industries}")
+print(f"Total job-industry links: {counts.total_job_industries}")
 
 # Sample industries
 industries = db.query(Industry).limit(5).all()
@@ -2,23 +2,67 @@
 Database Configuration
 SQLite for simplicity - perfect for academic project demo
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 import os
 
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), "job_forecaster.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
 
 # Create engine
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args={
+        "check_same_thread": False,  # Needed for SQLite
+        "isolation_level": None  # Disable pysqlite implicit transactions, BEGIN is emitted below
+    },
+    # Read-heavy API: forecasting endpoints hold several sessions at once
+    poolclass=QueuePool,
+    pool_size=20,
+    max_overflow=40,
+    pool_pre_ping=False,  # local file, connections don't go stale
+    pool_recycle=3600,
+    query_cache_size=1200  # keep compiled SQL for every hot statement
 )
 
+# Async engine for read-only endpoints - waiting on the DB doesn't hold a threadpool slot
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=3600,
+    query_cache_size=1200
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """Tune SQLite for fast bulk loads and concurrent readers"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-200000")  # ~200MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+    cursor.close()
+
+
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragma)
+
+
+@event.listens_for(engine, "begin")
+def _do_begin(conn):
+    """Start transactions explicitly so one commit covers a whole batch of work"""
+    conn.exec_driver_sql("BEGIN")
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -31,7 +75,42 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Data version, stored in the file header (PRAGMA user_version) so it is
+# shared by every process - API workers clear their caches when it moves
+def get_data_version() -> int:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+def bump_data_version(db):
+    """Mark the data as changed; takes effect when `db` commits"""
+    version = db.execute(text("PRAGMA user_version")).scalar()
+    db.execute(text(f"PRAGMA user_version = {int(version) + 1}"))
+
 # Create all tables
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so add columns declared after the table was created
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                        f"{column.type.compile(engine.dialect)}"
+                    )
+    # create_all skips existing tables, so add indexes declared after the table was created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # e.g. a unique index over rows loaded before it existed - re-run the ETL
+                print(f"[WARN] Could not create index {index.name}: {e}")
     print(f"[OK] Database initialized at: {DB_PATH}")
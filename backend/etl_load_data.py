@@ -4,106 +4,148 @@ Run this once to populate the database
 """
 import pandas as pd
 import os
-from sqlalchemy.orm import Session
-from database import engine, init_db, SessionLocal
+from sqlalchemy import text, select, delete, insert, func, and_, true
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, aliased
+from database import engine, init_db, SessionLocal, bump_data_version
 from models import (
     Job, Company, Salary, Skill, JobSkill, 
-    Industry, JobIndustry, CompanyIndustry, Benefit
+    Industry, JobIndustry, CompanyIndustry, Benefit, SkillCooccurrence, OccupationCount
 )
 from datetime import datetime
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+# pyarrow's CSV reader parses on all cores (optional)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Path to data folder
 DATA_PATH = "../data/raw"
 
-def load_companies(db: Session):
-    """Load companies from CSV"""
+# Rows per bulk_insert_mappings call / rows per pd.read_csv chunk
+BATCH_SIZE = 5000
+CSV_CHUNK_SIZE = 50000
+
+
+def read_csv(file_path: str, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Read a whole CSV, with pyarrow's multi-threaded parser when installed"""
+    if PYARROW_AVAILABLE:
+        try:
+            table = pv.read_csv(file_path, read_options=pv.ReadOptions(block_size=1 << 20))
+            df = table.to_pandas(self_destruct=True)
+            return df.iloc[:nrows] if nrows is not None else df
+        except pa.ArrowInvalid:
+            pass  # Column types differ between blocks - let pandas infer them
+    
+    return pd.read_csv(file_path, nrows=nrows)
+
+
+def prefetch_csv(relative_path: str, nrows: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """Read a CSV under DATA_PATH, or None if it does not exist"""
+    file_path = os.path.join(DATA_PATH, relative_path)
+    if not os.path.exists(file_path):
+        return None
+    return read_csv(file_path, nrows=nrows)
+
+
+def read_csv_chunks(file_path: str, max_rows: Optional[int] = None):
+    """Yield DataFrame chunks of a CSV, stopping after max_rows rows"""
+    loaded = 0
+    for chunk in pd.read_csv(file_path, chunksize=CSV_CHUNK_SIZE):
+        if max_rows is not None:
+            chunk = chunk.iloc[:max_rows - loaded]
+        loaded += len(chunk)
+        yield chunk
+        if max_rows is not None and loaded >= max_rows:
+            break
+
+
+def to_records(df: pd.DataFrame, columns: List[str]) -> List[Dict]:
+    """Select model columns (missing ones become NULL) and map NaN to None"""
+    df = df.reindex(columns=columns).astype(object)
+    return df.where(df.notna(), None).to_dict(orient="records")
+
+
+def bulk_insert(db: Session, model, records: List[Dict]):
+    """Insert plain dicts in batches, bypassing ORM object construction.
+    Does not commit - each loader commits once so the load is one transaction.
+    """
+    for i in range(0, len(records), BATCH_SIZE):
+        db.bulk_insert_mappings(model, records[i:i + BATCH_SIZE])
+
+
+def insert_or_ignore(db: Session, model, records: List[Dict]):
+    """Core executemany INSERT ... ON CONFLICT DO NOTHING - duplicate rows
+    (by the table's unique constraints) are skipped instead of failing the load.
+    """
+    stmt = sqlite_insert(model.__table__).on_conflict_do_nothing()
+    for i in range(0, len(records), BATCH_SIZE):
+        db.execute(stmt, records[i:i + BATCH_SIZE])
+
+
+def load_companies(db: Session, df: Optional[pd.DataFrame] = None):
+    """Load companies from CSV (or an already parsed frame)"""
     print("📦 Loading companies...")
     
     file_path = os.path.join(DATA_PATH, "companies/companies.csv")
-    if not os.path.exists(file_path):
-        print(f"❌ File not found: {file_path}")
-        return
-    
-    df = pd.read_csv(file_path, nrows=10000)  # Limit for demo
-    
-    companies = []
-    for _, row in df.iterrows():
-        company = Company(
-            company_id=str(row['company_id']),
-            name=row.get('name'),
-            description=row.get('description'),
-            company_size=row.get('company_size'),
-            state=row.get('state'),
-            country=row.get('country'),
-            city=row.get('city'),
-            zip_code=row.get('zip_code'),
-            address=row.get('address'),
-            url=row.get('url')
-        )
-        companies.append(company)
-        
-        if len(companies) >= 1000:  # Batch insert
-            db.bulk_save_objects(companies)
-            db.commit()
-            companies = []
-            print(f"  ✓ Inserted batch...")
+    if df is None:
+        if not os.path.exists(file_path):
+            print(f"❌ File not found: {file_path}")
+            return
+        df = read_csv(file_path, nrows=10000)  # Limit for demo
+    
+    df['company_id'] = df['company_id'].astype(str)
+    records = to_records(df, [
+        'company_id', 'name', 'description', 'company_size', 'state',
+        'country', 'city', 'zip_code', 'address', 'url'
+    ])
+    bulk_insert(db, Company, records)
     
-    if companies:
-        db.bulk_save_objects(companies)
-        db.commit()
-    
-    print(f"✅ Loaded {df.shape[0]} companies")
+    db.commit()
+    print(f"✅ Loaded {len(records)} companies")
 
 
-def load_skills(db: Session):
+def load_skills(db: Session, df: Optional[pd.DataFrame] = None):
     """Load skills mapping"""
     print("📦 Loading skills...")
     
     file_path = os.path.join(DATA_PATH, "mappings/skills.csv")
-    if not os.path.exists(file_path):
-        print(f"❌ File not found: {file_path}")
-        return
+    if df is None:
+        if not os.path.exists(file_path):
+            print(f"❌ File not found: {file_path}")
+            return
+        df = read_csv(file_path)
     
-    df = pd.read_csv(file_path)
+    records = to_records(df, ['skill_abr', 'skill_name'])
+    insert_or_ignore(db, Skill, records)  # skill_abr and skill_name are both unique
     
-    skills = []
-    for _, row in df.iterrows():
-        skill = Skill(
-            skill_abr=row['skill_abr'],
-            skill_name=row['skill_name']
-        )
-        skills.append(skill)
-    
-    db.bulk_save_objects(skills)
     db.commit()
-    
-    print(f"✅ Loaded {len(skills)} skills")
+    print(f"✅ Loaded {len(records)} skills")
 
 
-def load_industries(db: Session):
+def load_industries(db: Session, df: Optional[pd.DataFrame] = None):
     """Load industries mapping"""
     print("📦 Loading industries...")
     
     file_path = os.path.join(DATA_PATH, "mappings/industries.csv")
-    if not os.path.exists(file_path):
-        print(f"❌ File not found: {file_path}")
-        return
+    if df is None:
+        if not os.path.exists(file_path):
+            print(f"❌ File not found: {file_path}")
+            return
+        df = read_csv(file_path)
     
-    df = pd.read_csv(file_path)
+    df['industry_id'] = df['industry_id'].astype(int)
+    records = to_records(df, ['industry_id', 'industry_name'])
+    bulk_insert(db, Industry, records)
     
-    industries = []
-    for _, row in df.iterrows():
-        industry = Industry(
-            industry_id=int(row['industry_id']),
-            industry_name=row['industry_name']
-        )
-        industries.append(industry)
-    
-    db.bulk_save_objects(industries)
     db.commit()
-    
-    print(f"✅ Loaded {len(industries)} industries")
+    print(f"✅ Loaded {len(records)} industries")
 
 
 def load_jobs_sample(db: Session):
@@ -116,45 +158,30 @@ def load_jobs_sample(db: Session):
         print(f"❌ File not found: {file_path}")
         return
     
-    # Read in chunks
-    chunk_size = 10000
     total_loaded = 0
     max_rows = 50000  # Limit for demo
     
     try:
-        for chunk in pd.read_csv(file_path, chunksize=chunk_size):
-            if total_loaded >= max_rows:
-                break
-            
-            jobs = []
-            for _, row in chunk.iterrows():
-                job = Job(
-                    job_id=str(row['job_id']),
-                    title=row.get('title'),
-                    description=row.get('description'),
-                    company_id=row.get('company_id'),
-                    location=row.get('location'),
-                    city=row.get('city'),
-                    state=row.get('state'),
-                    country=row.get('country'),
-                    work_type=row.get('work_type'),
-                    is_active=True
-                )
-                jobs.append(job)
-            
-            db.bulk_save_objects(jobs)
-            db.commit()
-            total_loaded += len(jobs)
+        for chunk in read_csv_chunks(file_path, max_rows=max_rows):
+            chunk['job_id'] = chunk['job_id'].astype(str)
+            # Match Company.company_id (read as int, stored as string); NaN stays NULL
+            chunk['company_id'] = chunk['company_id'].astype('Int64').astype('string')
+            chunk['is_active'] = True
+            records = to_records(chunk, [
+                'job_id', 'title', 'description', 'company_id', 'location',
+                'city', 'state', 'country', 'work_type', 'is_active'
+            ])
+            bulk_insert(db, Job, records)
+            total_loaded += len(records)
             
             print(f"  ✓ Loaded {total_loaded} jobs so far...")
-            
-            if total_loaded >= max_rows:
-                break
         
+        db.commit()
         print(f"✅ Loaded {total_loaded} jobs (sample)")
         
     except Exception as e:
         print(f"❌ Error loading jobs: {e}")
+        db.rollback()
 
 
 def load_salaries(db: Session):
@@ -166,37 +193,24 @@ def load_salaries(db: Session):
         print(f"❌ File not found: {file_path}")
         return
     
-    df = pd.read_csv(file_path, nrows=20000)  # Limit for demo
+    total = 0
+    for chunk in read_csv_chunks(file_path, max_rows=20000):  # Limit for demo
+        chunk['salary_id'] = chunk['salary_id'].astype(str)
+        chunk['job_id'] = chunk['job_id'].astype(str)
+        records = to_records(chunk, [
+            'salary_id', 'job_id', 'max_salary', 'med_salary', 'min_salary',
+            'pay_period', 'currency', 'compensation_type'
+        ])
+        insert_or_ignore(db, Salary, records)
+        total += len(records)
+        print(f"  ✓ Inserted {total} salaries so far...")
     
-    salaries = []
-    for _, row in df.iterrows():
-        salary = Salary(
-            salary_id=str(row['salary_id']),
-            job_id=str(row['job_id']),
-            max_salary=row.get('max_salary'),
-            med_salary=row.get('med_salary'),
-            min_salary=row.get('min_salary'),
-            pay_period=row.get('pay_period'),
-            currency=row.get('currency'),
-            compensation_type=row.get('compensation_type')
-        )
-        salaries.append(salary)
-        
-        if len(salaries) >= 1000:
-            db.bulk_save_objects(salaries)
-            db.commit()
-            salaries = []
-            print(f"  ✓ Inserted batch...")
-    
-    if salaries:
-        db.bulk_save_objects(salaries)
-        db.commit()
-    
-    print(f"✅ Loaded {df.shape[0]} salaries")
+    db.commit()
+    print(f"✅ Loaded {total} salaries")
 
 
-def load_job_skills(db: Session):
-    """Load job-skill relationships"""
+def load_job_skills(db: Session, skills_map: Dict[str, str]):
+    """Load job-skill relationships (skills_map: skill_abr -> skill_name)"""
     print("📦 Loading job skills...")
     
     file_path = os.path.join(DATA_PATH, "jobs/job_skills.csv")
@@ -204,27 +218,17 @@ def load_job_skills(db: Session):
         print(f"❌ File not found: {file_path}")
         return
     
-    df = pd.read_csv(file_path, nrows=50000)  # Limit for demo
-    
-    job_skills = []
-    for _, row in df.iterrows():
-        js = JobSkill(
-            job_id=str(row['job_id']),
-            skill_abr=row['skill_abr']
-        )
-        job_skills.append(js)
-        
-        if len(job_skills) >= 1000:
-            db.bulk_save_objects(job_skills)
-            db.commit()
-            job_skills = []
-            print(f"  ✓ Inserted batch...")
-    
-    if job_skills:
-        db.bulk_save_objects(job_skills)
-        db.commit()
+    total = 0
+    for chunk in read_csv_chunks(file_path, max_rows=50000):  # Limit for demo
+        chunk[['job_id', 'skill_abr']] = chunk[['job_id', 'skill_abr']].astype(str)
+        chunk['skill_name'] = chunk['skill_abr'].map(skills_map)
+        records = to_records(chunk, ['job_id', 'skill_abr', 'skill_name'])
+        insert_or_ignore(db, JobSkill, records)
+        total += len(records)
+        print(f"  ✓ Inserted {total} job skills so far...")
     
-    print(f"✅ Loaded {df.shape[0]} job-skill relationships")
+    db.commit()
+    print(f"✅ Loaded {total} job-skill relationships")
 
 
 def load_benefits(db: Session):
@@ -236,28 +240,107 @@ def load_benefits(db: Session):
         print(f"❌ File not found: {file_path}")
         return
     
-    df = pd.read_csv(file_path, nrows=20000)  # Limit for demo
+    total = 0
+    for chunk in read_csv_chunks(file_path, max_rows=20000):  # Limit for demo
+        chunk['job_id'] = chunk['job_id'].astype(str)
+        chunk['inferred'] = chunk['inferred'].astype(bool)
+        records = to_records(chunk, ['job_id', 'type', 'inferred'])
+        insert_or_ignore(db, Benefit, records)
+        total += len(records)
+        print(f"  ✓ Inserted {total} benefits so far...")
     
-    benefits = []
-    for _, row in df.iterrows():
-        benefit = Benefit(
-            job_id=str(row['job_id']),
-            type=row['type'],
-            inferred=bool(row['inferred'])
-        )
-        benefits.append(benefit)
-        
-        if len(benefits) >= 1000:
-            db.bulk_save_objects(benefits)
-            db.commit()
-            benefits = []
-            print(f"  ✓ Inserted batch...")
+    db.commit()
+    print(f"✅ Loaded {total} benefits")
+
+
+def build_skill_cooccurrence(db: Session):
+    """Materialize job counts for every ordered pair of skills sharing a job"""
+    print("📦 Building skill co-occurrence...")
     
-    if benefits:
-        db.bulk_save_objects(benefits)
-        db.commit()
+    js1 = aliased(JobSkill)
+    js2 = aliased(JobSkill)
+    pairs = select(js1.skill_name, js2.skill_name, func.count())\
+        .select_from(js1)\
+        .join(js2, and_(js1.job_id == js2.job_id, js1.skill_name != js2.skill_name))\
+        .group_by(js1.skill_name, js2.skill_name)
+    
+    table = SkillCooccurrence.__table__
+    db.execute(delete(table))
+    result = db.execute(insert(table).from_select(['skill_a', 'skill_b', 'job_count'], pairs))
     
-    print(f"✅ Loaded {df.shape[0]} benefits")
+    db.commit()
+    print(f"✅ Built {result.rowcount} skill pairs")
+
+
+def link_job_skill_ids(db: Session):
+    """Resolve job_skills.skill_abr to the integer skills.id key used by joins"""
+    db.execute(text(
+        "UPDATE job_skills SET skill_id = "
+        "(SELECT s.id FROM skills s WHERE s.skill_abr = job_skills.skill_abr) "
+        "WHERE skill_id IS NULL"
+    ))
+    db.commit()
+
+
+def ensure_skill_cooccurrence(db: Session):
+    """Build skill_cooccurrence on databases loaded before the table existed (pairs come from job_skills.skill_name)"""
+    if db.execute(select(SkillCooccurrence.id).limit(1)).first() is None:
+        build_skill_cooccurrence(db)
+
+
+def backfill_job_skill_names(db: Session):
+    """Fill the denormalized job_skills.skill_name on rows loaded before the column existed"""
+    db.execute(text(
+        "UPDATE job_skills SET skill_name = "
+        "(SELECT s.skill_name FROM skills s WHERE s.id = job_skills.skill_id) "
+        "WHERE skill_name IS NULL"
+    ))
+    db.commit()
+
+
+def refresh_skill_job_counts(db: Session):
+    """Store each skill's job count on the skill row, so readers skip the GROUP BY"""
+    db.execute(text(
+        "UPDATE skills SET cached_job_count = "
+        "(SELECT COUNT(*) FROM job_skills js WHERE js.skill_id = skills.id)"
+    ))
+    db.commit()
+
+
+def refresh_occupation_counts(db: Session):
+    """Rebuild the active-jobs-per-title table behind the top-occupations endpoint"""
+    # Literal `is_active = 1` (not a bound parameter) so SQLite can use ix_jobs_active_title
+    counts = select(Job.title, func.count())\
+        .where(Job.is_active == true())\
+        .group_by(Job.title)
+    
+    table = OccupationCount.__table__
+    db.execute(delete(table))
+    db.execute(insert(table).from_select(['title', 'job_count'], counts))
+    db.commit()
+
+
+def prepare_database():
+    """
+    Bring an existing database up to date before serving: add missing
+    columns/indexes and refresh the derived tables. Run once per start
+    (main.py does it before launching uvicorn), not in each worker -
+    concurrent workers would migrate the same SQLite file at once.
+    """
+    init_db()
+    db = SessionLocal()
+    try:
+        link_job_skill_ids(db)  # Rows loaded before skill_id existed
+        backfill_job_skill_names(db)  # ...or before skill_name existed
+        ensure_skill_cooccurrence(db)
+        refresh_skill_job_counts(db)
+        refresh_occupation_counts(db)
+        
+        from forecasting import recompute_skill_trends  # Pulls in the model libraries
+        recompute_skill_trends(db)
+    finally:
+        db.close()
+    print("[OK] Database prepared")
 
 
 def main():
@@ -275,14 +358,43 @@ def main():
     db = SessionLocal()
     
     try:
+        # Parse the independent reference files concurrently; inserts stay
+        # sequential because SQLite only allows one writer at a time
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            companies_df, skills_df, industries_df = pool.map(
+                lambda args: prefetch_csv(*args),
+                [
+                    ("companies/companies.csv", 10000),  # Limit for demo
+                    ("mappings/skills.csv", None),
+                    ("mappings/industries.csv", None)
+                ]
+            )
+        
         # Load data in order (respect foreign keys)
-        load_companies(db)
-        load_skills(db)
-        load_industries(db)
+        load_companies(db, companies_df)
+        load_skills(db, skills_df)
+        load_industries(db, industries_df)
+        
+        # Reference data used to enrich later loaders, read once per run
+        skills_map = dict(db.query(Skill.skill_abr, Skill.skill_name).all())
+        
         load_jobs_sample(db)  # Takes longest
         load_salaries(db)
-        load_job_skills(db)
+        load_job_skills(db, skills_map)
+        link_job_skill_ids(db)
         load_benefits(db)
+        build_skill_cooccurrence(db)
+        refresh_skill_job_counts(db)
+        refresh_occupation_counts(db)
+        
+        from forecasting import recompute_skill_trends  # Pulls in the model libraries
+        recompute_skill_trends(db)
+        
+        # Refresh planner statistics so the new indexes are used
+        db.execute(text("ANALYZE"))
+        # Running API workers drop memoized results computed from the old data
+        bump_data_version(db)
+        db.commit()
         
         print("\n" + "=" * 60)
         print("✅ ETL Process Completed Successfully!")
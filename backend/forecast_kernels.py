@@ -0,0 +1,159 @@
+"""
+Forecast Kernels
+Small numeric routines called inside forecasting loops - JIT-compiled with Numba when installed
+(the scoring kernels use fastmath: their inputs are finite, NaNs are replaced beforehand)
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback: run the kernels as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def roll_features(row, recent, new_value, lags):
+    """
+    Append new_value to `recent` (last values, oldest first - updated in place)
+    and write the next-step XGBoost features into `row`:
+    lag_k..., rolling_mean_3, rolling_std_3, rolling_mean_6, momentum_3, momentum_6
+    """
+    n = recent.shape[0]
+    for i in range(n - 1):
+        recent[i] = recent[i + 1]
+    recent[n - 1] = new_value
+
+    # Lag features
+    for j in range(lags.shape[0]):
+        row[j] = recent[n - lags[j]]
+
+    # Rolling statistics
+    col = lags.shape[0]
+    mean3 = (recent[n - 1] + recent[n - 2] + recent[n - 3]) / 3.0
+    var3 = ((recent[n - 1] - mean3) ** 2 +
+            (recent[n - 2] - mean3) ** 2 +
+            (recent[n - 3] - mean3) ** 2) / 2.0
+    sum6 = 0.0
+    for i in range(n - 6, n):
+        sum6 += recent[i]
+
+    row[col] = mean3
+    row[col + 1] = np.sqrt(var3)
+    row[col + 2] = sum6 / 6.0
+
+    # Momentum
+    row[col + 3] = recent[n - 1] - recent[n - 4]
+    row[col + 4] = recent[n - 1] - recent[n - 7]
+
+
+@njit(cache=True, fastmath=True)
+def growth_rates(history, totals):
+    """
+    Growth % per row of monthly counts: last 3 months vs first 3.
+    0 for skills with no jobs at all, 100 when the first 3 months are empty.
+    """
+    n, months = history.shape
+    out = np.empty(n)
+    for i in range(n):
+        recent = 0.0
+        previous = 0.0
+        for j in range(3):
+            recent += history[i, months - 1 - j]
+            previous += history[i, j]
+
+        if totals[i] == 0:
+            out[i] = 0.0
+        elif previous == 0:
+            out[i] = 100.0
+        else:
+            out[i] = (recent - previous) / previous * 100
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def hotness_scores(volume, growth, salary_premium, demand, alpha, beta, gamma, delta):
+    """
+    Hotness = α×Volume + β×Growth + γ×Salary + δ×Demand, each normalized to 0-100
+    (100 jobs = 100% volume, -50%..+50% growth → 0..100)
+    """
+    n = volume.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        volume_norm = min(100.0, volume[i])
+        growth_norm = min(100.0, max(0.0, growth[i] + 50))
+        salary_norm = min(100.0, salary_premium[i])
+        demand_norm = min(100.0, demand[i])
+        out[i] = alpha * volume_norm + beta * growth_norm + gamma * salary_norm + delta * demand_norm
+    return out
+
+
+DEFAULT_HOTNESS_WEIGHTS = (0.3, 0.3, 0.2, 0.2)
+
+
+@njit(cache=True, fastmath=True)
+def hotness_scores_default(volume, growth, salary_premium, demand):
+    """hotness_scores with DEFAULT_HOTNESS_WEIGHTS compiled in as constants"""
+    n = volume.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        volume_norm = min(100.0, volume[i])
+        growth_norm = min(100.0, max(0.0, growth[i] + 50))
+        salary_norm = min(100.0, salary_premium[i])
+        demand_norm = min(100.0, demand[i])
+        out[i] = 0.3 * (volume_norm + growth_norm) + 0.2 * (salary_norm + demand_norm)
+    return out
+
+
+@njit(cache=True)
+def linear_forecast(y, periods):
+    """Least-squares line through y (x = 0..n-1), evaluated at the next `periods` x values"""
+    n = y.shape[0]
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    sxy = 0.0
+    for i in range(n):
+        sx += i
+        sy += y[i]
+        sxx += i * i
+        sxy += i * y[i]
+
+    denom = n * sxx - sx * sx
+    slope = (n * sxy - sx * sy) / denom if denom != 0 else 0.0
+    intercept = (sy - slope * sx) / n
+
+    out = np.empty(periods)
+    for i in range(periods):
+        out[i] = intercept + slope * (n + i)
+    return out
+
+
+@njit(cache=True)
+def confidence(y):
+    """Forecast confidence (0-100) from history length and coefficient of variation"""
+    n = y.shape[0]
+    if n < 3:
+        return 0.0
+
+    # More data = higher confidence
+    data_confidence = min(1.0, n / 12) * 100
+
+    # Lower variance = higher confidence
+    mean = y.mean()
+    if mean > 0:
+        var = 0.0
+        for i in range(n):
+            var += (y[i] - mean) ** 2
+        cv = np.sqrt(var / (n - 1)) / mean
+    else:
+        cv = 1.0
+    variance_confidence = max(0.0, 1 - cv) * 100
+
+    return (data_confidence + variance_confidence) / 2
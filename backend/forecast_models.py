@@ -4,15 +4,46 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime, timedelta
-import pickle
 import os
+import re
+import hashlib
+import joblib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from forecast_kernels import roll_features, linear_forecast
+
+# Model libraries are resolved once per process (Prophet's import is slow),
+# not on every forecaster construction
+try:
+    from prophet import Prophet as _Prophet
+except ImportError:
+    _Prophet = None
+
+try:
+    import xgboost as _xgb
+except ImportError:
+    _xgb = None
+
+# Fast joblib compression for saved models (zlib otherwise)
+try:
+    import lz4  # noqa: F401
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=64)
+def _ms_range(n: int, end_ts_ordinal: int) -> pd.DatetimeIndex:
+    """Monthly (month-start) dates ending at the given day - shared by every series of length n"""
+    return pd.date_range(end=pd.Timestamp.fromordinal(end_ts_ordinal), periods=n, freq='MS')
+
 # ============================================
 # 1. PROPHET FORECASTING
 # ============================================
@@ -23,31 +54,34 @@ class ProphetForecaster:
     Good for: handling seasonality, trends, holidays
     """
     
-    def __init__(self):
-        try:
-            from prophet import Prophet
-            self.Prophet = Prophet
-        except ImportError:
+    def __init__(self, uncertainty_samples: int = 0):
+        # 0 skips the posterior simulation in predict(); upper/lower then come from
+        # the in-sample residuals (95% band) instead of Prophet's sampled interval
+        self.uncertainty_samples = uncertainty_samples
+        
+        self.Prophet = _Prophet
+        if self.Prophet is None:
             logger.warning("Prophet not installed. Run: pip install prophet")
-            self.Prophet = None
     
     def prepare_data(self, df: pd.DataFrame, value_col: str) -> pd.DataFrame:
         """
         Convert to Prophet format (ds, y)
         """
+        ds = df.index if isinstance(df.index, pd.DatetimeIndex) else pd.to_datetime(df.index)
         prophet_df = pd.DataFrame({
-            'ds': pd.to_datetime(df.index),
-            'y': df[value_col].values
-        })
+            'ds': ds,
+            'y': df[value_col].to_numpy(dtype=np.float64, copy=False)
+        }, copy=False)
         return prophet_df
     
-    def fit_forecast(self, data, periods: int = 6) -> Dict:
+    def fit_forecast(self, data, periods: int = 6, skill: Optional[str] = None) -> Dict:
         """
         Fit Prophet model and forecast
         
         Args:
             data: pd.Series or pd.DataFrame with time series data
             periods: Number of periods to forecast
+            skill: If given, the fitted model is cached on disk for this exact series
         """
         if self.Prophet is None:
             logger.error("Prophet not available")
@@ -56,12 +90,15 @@ class ProphetForecaster:
         try:
             # Convert Series to Prophet DataFrame format
             if isinstance(data, pd.Series):
-                # Create date range for the series
-                dates = pd.date_range(end=pd.Timestamp.today(), periods=len(data), freq='MS')
+                # Use the series' own dates, or a monthly range ending today
+                if isinstance(data.index, pd.DatetimeIndex):
+                    dates = data.index
+                else:
+                    dates = _ms_range(len(data), pd.Timestamp.today().toordinal())
                 df = pd.DataFrame({
                     'ds': dates,
-                    'y': data.values
-                })
+                    'y': data.to_numpy(dtype=np.float64, copy=False)
+                }, copy=False)
             elif isinstance(data, pd.DataFrame):
                 # Check if already in Prophet format
                 if 'ds' not in data.columns or 'y' not in data.columns:
@@ -72,29 +109,48 @@ class ProphetForecaster:
                 logger.error("Data must be pandas Series or DataFrame")
                 return None
             
-            model = self.Prophet(
-                yearly_seasonality=True,
-                weekly_seasonality=False,
-                daily_seasonality=False,
-                interval_width=0.95
-            )
+            def fit():
+                model = self.Prophet(
+                    yearly_seasonality=True,
+                    weekly_seasonality=False,
+                    daily_seasonality=False,
+                    interval_width=0.95,
+                    mcmc_samples=0,  # MAP fit (LBFGS)
+                    uncertainty_samples=self.uncertainty_samples,
+                    n_changepoints=min(25, max(2, len(df) // 4))  # Don't over-parameterize short series
+                )
+                return model.fit(df)
             
-            # Fit
-            model.fit(df)
+            # Fit (or reuse the model fitted on this same data)
+            if skill:
+                model = ModelManager.fit_or_load(f"prophet{self.uncertainty_samples}_{skill}", df, fit)
+            else:
+                model = fit()
             
             # Forecast
             future = model.make_future_dataframe(periods=periods, freq='MS')
             forecast = model.predict(future)
             
             # Extract predictions (only future periods)
-            predictions = forecast['yhat'].tail(periods).values
+            tail_slice = forecast.iloc[-periods:]
+            predictions = tail_slice['yhat'].to_numpy()
+            
+            if self.uncertainty_samples:
+                upper = tail_slice['yhat_upper'].to_numpy()
+                lower = tail_slice['yhat_lower'].to_numpy()
+            else:
+                # 95% band from the in-sample residuals
+                yhat = forecast['yhat'].to_numpy()
+                residual_std = np.std(df['y'].to_numpy(dtype=np.float64) - yhat[:len(df)])
+                upper = predictions + 1.96 * residual_std
+                lower = predictions - 1.96 * residual_std
             
             # Extract results
             result = {
                 'predictions': predictions.tolist(),
                 'forecast_values': predictions.tolist(),  # For backward compatibility
-                'upper': forecast['yhat_upper'].tail(periods).values.tolist(),
-                'lower': forecast['yhat_lower'].tail(periods).values.tolist(),
+                'upper': upper.tolist(),
+                'lower': lower.tolist(),
                 'model': model
             }
             
@@ -123,20 +179,58 @@ class ARIMAForecaster:
     """
     
     def __init__(self):
+        # statsforecast's JIT-compiled ARIMA is much faster than statsmodels' Kalman filter
+        try:
+            from statsforecast.models import ARIMA, AutoARIMA
+            self.ARIMA = ARIMA
+            self.AutoARIMA = AutoARIMA
+        except ImportError:
+            self.ARIMA = None
+            self.AutoARIMA = None
+        
         try:
             from statsmodels.tsa.statespace.sarimax import SARIMAX
             self.SARIMAX = SARIMAX
         except ImportError:
-            logger.warning("statsmodels not installed. Run: pip install statsmodels")
+            if self.ARIMA is None:
+                logger.warning("statsmodels not installed. Run: pip install statsmodels")
             self.SARIMAX = None
     
     def fit_forecast(self, series: pd.Series, order=(1,1,1), 
                      seasonal_order=(1,1,1,12), periods=6) -> Dict:
         """
         Fit SARIMA and forecast
-        order: (p, d, q)
+        order: (p, d, q), or None to let statsforecast's AutoARIMA pick the orders
         seasonal_order: (P, D, Q, s)
         """
+        if order is None and self.AutoARIMA is None:
+            order = (1, 1, 1)  # No order search without statsforecast
+        
+        if self.ARIMA is not None:
+            try:
+                if order is None:
+                    model = self.AutoARIMA(season_length=seasonal_order[-1])
+                else:
+                    model = self.ARIMA(
+                        order=order,
+                        season_length=seasonal_order[-1],
+                        seasonal_order=seasonal_order[:3]
+                    )
+                model.fit(np.asarray(series, dtype=np.float64))
+                fcst = model.predict(h=periods, level=[95])
+                
+                result = {
+                    'forecast': fcst['mean'].tolist(),
+                    'ci': np.column_stack([fcst['lo-95'], fcst['hi-95']]).tolist(),
+                    'model': model
+                }
+                
+                logger.info(f"SARIMA forecast complete: {periods} periods")
+                return result
+            
+            except Exception as e:
+                logger.warning(f"statsforecast ARIMA failed, falling back to statsmodels: {e}")
+        
         if self.SARIMAX is None:
             logger.error("SARIMA not available")
             return None
@@ -144,7 +238,7 @@ class ARIMAForecaster:
         try:
             model = self.SARIMAX(
                 series,
-                order=order,
+                order=order or (1, 1, 1),
                 seasonal_order=seasonal_order,
                 enforce_stationarity=False,
                 enforce_invertibility=False
@@ -176,42 +270,86 @@ class XGBoostForecaster:
     Features: lag counts, growth rate, volume, external indicators
     """
     
-    def __init__(self):
-        try:
-            import xgboost as xgb
-            self.xgb = xgb
-        except ImportError:
+    LAGS = [1, 3, 6, 12]
+    FEATURE_NAMES = [f'lag_{lag}' for lag in LAGS] + [
+        'rolling_mean_3', 'rolling_std_3', 'rolling_mean_6', 'momentum_3', 'momentum_6'
+    ]
+    _gpu = None  # CUDA availability, probed once per process
+    
+    def __init__(self, n_jobs: Optional[int] = None):
+        self.n_jobs = n_jobs  # None = xgboost default (all cores)
+        
+        self.xgb = _xgb
+        if self.xgb is None:
             logger.warning("XGBoost not installed. Run: pip install xgboost")
-            self.xgb = None
+        
+        if self.xgb is not None and XGBoostForecaster._gpu is None:
+            XGBoostForecaster._gpu = self._detect_gpu()
     
-    def create_features(self, series: pd.Series, lags: List[int] = [1, 3, 6, 12]) -> pd.DataFrame:
+    def _detect_gpu(self) -> bool:
+        """Check whether xgboost can train on a CUDA device"""
+        if not self.xgb.build_info().get('USE_CUDA'):
+            return False
+        
+        try:
+            dtrain = self.xgb.DMatrix(np.zeros((2, 1), dtype=np.float32), label=[0.0, 1.0])
+            self.xgb.train({'tree_method': 'hist', 'device': 'cuda'}, dtrain, num_boost_round=1)
+            return True
+        except Exception:
+            return False
+    
+    def feature_matrix(self, values, lags: List[int] = LAGS) -> Tuple[np.ndarray, List[str], np.ndarray]:
         """
-        Create lag features + rolling statistics
+        Build [value, lags..., rolling stats, momentum] in one float64 array.
+        Returns (matrix, column names, mask of kept rows) - rows with any
+        missing feature are dropped.
         """
-        df = pd.DataFrame({'value': series})
+        v = np.asarray(values, dtype=np.float64)
+        n = len(v)
+        
+        names = ['value'] + [f'lag_{lag}' for lag in lags] + [
+            'rolling_mean_3', 'rolling_std_3', 'rolling_mean_6', 'momentum_3', 'momentum_6'
+        ]
+        out = np.full((n, len(names)), np.nan)
+        out[:, 0] = v
         
         # Lag features
-        for lag in lags:
-            df[f'lag_{lag}'] = df['value'].shift(lag)
+        for col, lag in enumerate(lags, 1):
+            if lag < n:
+                out[lag:, col] = v[:-lag]
         
         # Rolling statistics
-        df['rolling_mean_3'] = df['value'].rolling(3).mean()
-        df['rolling_std_3'] = df['value'].rolling(3).std()
-        df['rolling_mean_6'] = df['value'].rolling(6).mean()
+        col = len(lags) + 1
+        if n >= 3:
+            windows3 = sliding_window_view(v, 3)
+            out[2:, col] = windows3.mean(axis=1)
+            out[2:, col + 1] = windows3.std(axis=1, ddof=1)
+        if n >= 6:
+            out[5:, col + 2] = sliding_window_view(v, 6).mean(axis=1)
         
         # Momentum
-        df['momentum_3'] = df['value'].diff(3)
-        df['momentum_6'] = df['value'].diff(6)
+        if n > 3:
+            out[3:, col + 3] = v[3:] - v[:-3]
+        if n > 6:
+            out[6:, col + 4] = v[6:] - v[:-6]
         
         # Drop NaN
-        df = df.dropna()
-        
-        return df
+        mask = ~np.isnan(out).any(axis=1)
+        return out[mask], names, mask
+    
+    def create_features(self, series: pd.Series, lags: List[int] = LAGS) -> pd.DataFrame:
+        """
+        Create lag features + rolling statistics
+        """
+        data, names, mask = self.feature_matrix(series, lags)
+        index = series.index[mask] if isinstance(series, pd.Series) else None
+        return pd.DataFrame(data, columns=names, index=index)
     
     def fit_forecast(self, series: pd.Series, periods: int = 6, 
-                     test_size: float = 0.2) -> Dict:
+                     test_size: float = 0.2, skill: Optional[str] = None) -> Dict:
         """
         Fit XGBoost and forecast
+        If `skill` is given, the fitted model is cached on disk for this exact series
         """
         if self.xgb is None:
             logger.error("XGBoost not available")
@@ -219,60 +357,94 @@ class XGBoostForecaster:
         
         try:
             # Create features
-            df = self.create_features(series)
+            data, names, _ = self.feature_matrix(series, self.LAGS)
+            feature_names = names[1:]
             
-            X = df.drop('value', axis=1)
-            y = df['value']
+            # Contiguous float32 arrays - xgboost skips pandas introspection
+            X_arr = np.ascontiguousarray(data[:, 1:], dtype=np.float32)
+            y_arr = data[:, 0].astype(np.float32)
             
             # Train-test split
-            split = int(len(df) * (1 - test_size))
-            X_train, X_test = X[:split], X[split:]
-            y_train, y_test = y[:split], y[split:]
+            split = int(len(data) * (1 - test_size))
+            X_train, X_test = X_arr[:split], X_arr[split:]
+            y_train, y_test = y_arr[:split], y_arr[split:]
             
-            # Train XGBoost model
-            model = self.xgb.XGBRegressor(
-                n_estimators=100,
-                max_depth=5,
-                learning_rate=0.1,
-                subsample=0.8,
-                random_state=42,
-                early_stopping_rounds=10  # Move to constructor for newer versions
-            )
+            def fit():
+                # Train XGBoost model
+                model = self.xgb.XGBRegressor(
+                    tree_method='hist',
+                    device='cuda' if self._gpu else 'cpu',
+                    n_estimators=100,
+                    max_depth=5,
+                    learning_rate=0.1,
+                    subsample=0.8,
+                    random_state=42,
+                    n_jobs=self.n_jobs,
+                    early_stopping_rounds=10  # Move to constructor for newer versions
+                )
+                
+                # Fit model
+                model.fit(
+                    X_train, y_train,
+                    eval_set=[(X_test, y_test)],
+                    verbose=False
+                )
+                return model
             
-            # Fit model
-            model.fit(
-                X_train, y_train,
-                eval_set=[(X_test, y_test)],
-                verbose=False
-            )
+            # Fit (or reuse the model fitted on this same data); the features are
+            # derived from the whole series and the split from test_size, so both
+            # go into the cache key
+            if skill:
+                key = np.append(np.asarray(series, dtype=np.float64), test_size)
+                model = ModelManager.fit_or_load(f"xgboost_{skill}", key, fit)
+            else:
+                model = fit()
+            
+            # Predict straight from the booster, up to the early-stopping best iteration;
+            # single-row predictions don't amortize starting a thread team
+            booster = model.get_booster()
+            booster.set_param({'nthread': 1})
+            try:
+                iteration_range = (0, model.best_iteration + 1)
+            except AttributeError:
+                iteration_range = (0, 0)  # All trees
             
             # Calculate test score
             from sklearn.metrics import mean_absolute_error, r2_score
-            y_pred = model.predict(X_test)
+            y_pred = booster.inplace_predict(X_test, iteration_range=iteration_range)
             mae = mean_absolute_error(y_test, y_pred)
             r2 = r2_score(y_test, y_pred)
             
             logger.info(f"XGBoost - MAE: {mae:.2f}, R²: {r2:.3f}")
             
-            # Forecast future periods
-            last_features = X.iloc[-1:].copy()
-            forecasts = []
+            # Forecast future periods - lag_1 depends on the previous prediction,
+            # so steps stay sequential; the kernel fills row i of a preallocated
+            # float32 buffer and xgboost predicts straight from that row
+            lags = np.array(self.LAGS, dtype=np.int64)
+            window = max(max(self.LAGS), 6) + 1
+            values = np.asarray(series, dtype=np.float64)
+            recent = np.full(window, np.nan)
+            history = values[-(window + 1):-1]
+            recent[window - len(history):] = history
+            
+            buf = np.empty((periods, len(feature_names)), dtype=np.float32)
+            forecasts = np.empty(periods, dtype=np.float64)
+            pred = values[-1]
             
             for i in range(periods):
-                pred = model.predict(last_features)[0]
-                forecasts.append(pred)
-                
-                # Update features for next iteration
-                last_features = last_features.shift(1)
-                last_features['lag_1'] = pred
+                roll_features(buf[i], recent, pred, lags)
+                pred = float(booster.inplace_predict(buf[i:i + 1], iteration_range=iteration_range)[0])
+                forecasts[i] = pred
+            
+            clipped = np.clip(forecasts, 0, None).astype(np.int64).tolist()
             
             result = {
-                'predictions': [max(0, int(f)) for f in forecasts],
-                'forecast': [max(0, int(f)) for f in forecasts],  # For backward compatibility
+                'predictions': clipped,
+                'forecast': clipped,  # For backward compatibility
                 'mae': mae,
                 'r2': r2,
                 'model': model,
-                'feature_importance': dict(zip(X.columns, model.feature_importances_))
+                'feature_importance': self.get_feature_importance(model, feature_names)
             }
             
             return result
@@ -281,16 +453,18 @@ class XGBoostForecaster:
             logger.error(f"XGBoost error: {e}")
             return None
     
-    def get_feature_importance(self, model) -> Dict:
-        """Extract feature importance"""
-        if not hasattr(model, 'feature_importances_'):
+    def get_feature_importance(self, model, feature_names: List[str] = FEATURE_NAMES) -> Dict:
+        """Extract feature importance (share of total gain, from the booster's native scores)"""
+        if not hasattr(model, 'get_booster'):
             return {}
         
-        importance = dict(zip(
-            ['lag_1', 'lag_3', 'lag_6', 'lag_12', 'rolling_mean_3', 
-             'rolling_std_3', 'momentum_3', 'momentum_6'],
-            model.feature_importances_
-        ))
+        # Trained on plain arrays, so the booster names features f0..fN
+        scores = model.get_booster().get_score(importance_type='gain')
+        total = sum(scores.values()) or 1.0
+        importance = {
+            name: scores.get(f'f{i}', 0.0) / total
+            for i, name in enumerate(feature_names)
+        }
         
         return dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
 
@@ -304,29 +478,55 @@ class EnsembleForecaster:
     Default weights: Prophet 0.4, XGBoost 0.6
     """
     
-    def __init__(self, prophet_weight=0.4, xgboost_weight=0.6):
+    MIN_PROPHET_POINTS = 24  # Two years of monthly data - the batch job's Prophet threshold
+    LINEAR_R = 0.995  # |correlation| with time above which the history is treated as a line
+    
+    def __init__(self, prophet_weight=0.4, xgboost_weight=0.6, n_jobs: Optional[int] = None,
+                 min_prophet_points: int = 0):
         self.prophet = ProphetForecaster()
-        self.xgboost = XGBoostForecaster()
+        self.xgboost = XGBoostForecaster(n_jobs=n_jobs)
         self.prophet_weight = prophet_weight
         self.xgboost_weight = xgboost_weight
+        # Skip Prophet on histories shorter than this (0 = always fit). The API's
+        # 12-month histories are too short for XGBoost's lag_12, so they need Prophet.
+        self.min_prophet_points = min_prophet_points
     
-    def fit_forecast(self, series: pd.Series, periods: int = 6) -> Dict:
+    def fit_forecast(self, series: pd.Series, periods: int = 6, skill: Optional[str] = None) -> Dict:
         """
         Ensemble forecast combining Prophet + XGBoost
+        Pass `skill` to reuse fitted models from previous runs on the same data
         """
         
+        # Near-perfectly linear history: a straight line is as good as the models
+        x = np.arange(len(series))
+        y = np.asarray(series, dtype=np.float64)
+        if len(y) >= 3 and y.std() > 0 and abs(np.corrcoef(x, y)[0, 1]) > self.LINEAR_R:
+            forecast = np.clip(linear_forecast(y, periods), 0, None).astype(int).tolist()
+            
+            logger.info("Using linear trend (history is linear)")
+            return {
+                'predictions': forecast,
+                'forecast': forecast,  # For backward compatibility
+                'prophet': None,
+                'xgboost': None,
+                'method': 'linear'
+            }
+        
         prophet_result = None
         xgboost_result = None
         
-        # Prophet forecast
-        try:
-            prophet_result = self.prophet.fit_forecast(series, periods=periods)
-        except Exception as e:
-            logger.warning(f"Prophet forecast failed: {e}")
+        # Prophet forecast - its fixed fitting cost isn't worth it on short histories
+        if len(series) >= self.min_prophet_points:
+            try:
+                prophet_result = self.prophet.fit_forecast(series, periods=periods, skill=skill)
+            except Exception as e:
+                logger.warning(f"Prophet forecast failed: {e}")
+        else:
+            logger.debug(f"Skipping Prophet: {len(series)} points < {self.min_prophet_points}")
         
         # XGBoost forecast
         try:
-            xgboost_result = self.xgboost.fit_forecast(series, periods=periods)
+            xgboost_result = self.xgboost.fit_forecast(series, periods=periods, skill=skill)
         except Exception as e:
             logger.warning(f"XGBoost forecast failed: {e}")
         
@@ -336,16 +536,16 @@ class EnsembleForecaster:
             prophet_preds = prophet_result.get('predictions', prophet_result.get('forecast_values', []))
             xgboost_preds = xgboost_result.get('predictions', xgboost_result.get('forecast', []))
             
-            forecast = [
-                int(self.prophet_weight * p + self.xgboost_weight * x)
-                for p, x in zip(prophet_preds, xgboost_preds)
-            ]
+            forecast = np.rint(
+                self.prophet_weight * np.asarray(prophet_preds, dtype=np.float64) +
+                self.xgboost_weight * np.asarray(xgboost_preds, dtype=np.float64)
+            ).astype(int).tolist()
             
             logger.info(f"Ensemble forecast: {self.prophet_weight*100:.0f}% Prophet + {self.xgboost_weight*100:.0f}% XGBoost")
         
         elif xgboost_result:
             forecast = xgboost_result.get('predictions', xgboost_result.get('forecast', []))
-            logger.info("Using XGBoost only (Prophet failed)")
+            logger.info("Using XGBoost only (Prophet skipped or failed)")
         
         elif prophet_result:
             forecast = prophet_result.get('predictions', prophet_result.get('forecast_values', []))
@@ -377,6 +577,15 @@ class ForecastExplainer:
     Explain forecasts using SHAP or feature importance
     """
     
+    # Trend buckets by % change: <= -5, <= 5, <= 20, above
+    _BUCKETS = np.array([-5, 5, 20])
+    _LABELS = [
+        ("📉 Declining - Lower demand", "📉"),
+        ("➡️ Stable - Steady demand", "➡️"),
+        ("📈 Moderate Growth - Steady demand", "📊"),
+        ("🚀 Strong Uptrend - High demand expected", "📈"),
+    ]
+    
     @staticmethod
     def generate_explanation(forecast: Dict, series: pd.Series, 
                             item_name: str) -> Dict:
@@ -389,19 +598,10 @@ class ForecastExplainer:
         forecast_value = forecast['forecast'][0] if forecast['forecast'] else recent_value
         change_pct = ((forecast_value - recent_value) / recent_value * 100) if recent_value > 0 else 0
         
-        # Determine trend
-        if change_pct > 20:
-            trend_desc = "🚀 Strong Uptrend - High demand expected"
-            icon = "📈"
-        elif change_pct > 5:
-            trend_desc = "📈 Moderate Growth - Steady demand"
-            icon = "📊"
-        elif change_pct > -5:
-            trend_desc = "➡️ Stable - Steady demand"
-            icon = "➡️"
-        else:
-            trend_desc = "📉 Declining - Lower demand"
-            icon = "📉"
+        # Determine trend (bucket upper bounds are inclusive)
+        trend_desc, icon = ForecastExplainer._LABELS[
+            np.searchsorted(ForecastExplainer._BUCKETS, change_pct)
+        ]
         
         # Feature importance if XGBoost
         factors = []
@@ -429,76 +629,157 @@ class ForecastExplainer:
 class ModelManager:
     """Save/load trained models"""
     
+    # XGBoost models use xgboost's native UBJSON format, everything else compressed joblib
+    EXTENSIONS = ('.ubj', '.joblib')
+    COMPRESS = ('lz4', 3) if LZ4_AVAILABLE else ('zlib', 3)
+    # Next to this file, not the working directory, so every process shares one cache
+    MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+    
+    @staticmethod
+    def _find_model(model_name: str, model_dir: str = MODEL_DIR) -> Optional[str]:
+        """Path of a saved model, whichever format it was written in"""
+        for ext in ModelManager.EXTENSIONS:
+            filepath = os.path.join(model_dir, f"{model_name}{ext}")
+            if os.path.exists(filepath):
+                return filepath
+        return None
+    
     @staticmethod
-    def save_model(model, model_name: str, model_dir: str = "models"):
+    def save_model(model, model_name: str, model_dir: str = MODEL_DIR):
         """Save model to disk"""
         os.makedirs(model_dir, exist_ok=True)
-        filepath = os.path.join(model_dir, f"{model_name}.pkl")
         
         try:
-            with open(filepath, 'wb') as f:
-                pickle.dump(model, f)
+            if type(model).__module__.startswith('xgboost'):
+                filepath = os.path.join(model_dir, f"{model_name}.ubj")
+                model.save_model(filepath)
+            else:
+                filepath = os.path.join(model_dir, f"{model_name}.joblib")
+                joblib.dump(model, filepath, compress=ModelManager.COMPRESS)
             logger.info(f"Model saved: {filepath}")
         except Exception as e:
             logger.error(f"Failed to save model: {e}")
     
     @staticmethod
-    def load_model(model_name: str, model_dir: str = "models"):
+    def load_model(model_name: str, model_dir: str = MODEL_DIR):
         """Load model from disk"""
-        filepath = os.path.join(model_dir, f"{model_name}.pkl")
+        filepath = ModelManager._find_model(model_name, model_dir)
+        if filepath is None:
+            logger.error(f"Failed to load model: {model_name} not found in {model_dir}")
+            return None
         
         try:
-            with open(filepath, 'rb') as f:
-                model = pickle.load(f)
+            if filepath.endswith('.ubj'):
+                model = _xgb.XGBRegressor()
+                model.load_model(filepath)
+            else:
+                model = joblib.load(filepath)
             logger.info(f"Model loaded: {filepath}")
             return model
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             return None
+    
+    @staticmethod
+    def fit_or_load(skill: str, series, factory, model_dir: str = MODEL_DIR):
+        """
+        Return the model cached for this exact series, or fit it with
+        `factory()` and cache it. The key is a blake2b hash of the data, so
+        a refresh run on unchanged history skips fitting entirely. Only the
+        latest digest is kept per `skill`.
+        """
+        if isinstance(series, (pd.Series, pd.DataFrame)):
+            data = pd.util.hash_pandas_object(series, index=False).values
+        else:
+            data = np.ascontiguousarray(series)
+        digest = hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+        prefix = re.sub(r'[^A-Za-z0-9_.-]+', '_', skill)
+        model_name = f"{prefix}_{digest}"
+        
+        if ModelManager._find_model(model_name, model_dir):
+            model = ModelManager.load_model(model_name, model_dir)
+            if model is not None:
+                return model
+        
+        model = factory()
+        ModelManager.save_model(model, model_name, model_dir)
+        ModelManager._prune_models(prefix, model_name, model_dir)
+        return model
+    
+    @staticmethod
+    def _prune_models(prefix: str, keep: str, model_dir: str = MODEL_DIR):
+        """Delete models cached for `prefix` under older data digests"""
+        stale = re.compile(rf"{re.escape(prefix)}_[0-9a-f]{{32}}\.(?:ubj|joblib)")
+        for filename in os.listdir(model_dir):
+            if stale.fullmatch(filename) and os.path.splitext(filename)[0] != keep:
+                try:
+                    os.remove(os.path.join(model_dir, filename))
+                except OSError:
+                    pass  # Already removed by another worker
 
 # ============================================
 # 7. BATCH FORECASTING
 # ============================================
 
-def batch_forecast_all_skills(db_session, forecast_periods: int = 6) -> List[Dict]:
+_worker_forecaster = None
+
+
+def _init_forecast_worker():
+    """Process pool initializer: one single-threaded forecaster per worker"""
+    global _worker_forecaster
+    os.environ['OMP_NUM_THREADS'] = '1'
+    _worker_forecaster = EnsembleForecaster(
+        n_jobs=1,  # No oversubscription across workers
+        min_prophet_points=EnsembleForecaster.MIN_PROPHET_POINTS
+    )
+
+
+def _forecast_one(skill: str, counts: np.ndarray, periods: int) -> Dict:
+    """Forecast a single skill (top-level so it can be pickled to a worker)"""
+    series = pd.Series(counts)
+    
+    forecast = _worker_forecaster.fit_forecast(series, periods=periods, skill=skill)
+    explanation = ForecastExplainer.generate_explanation(forecast, series, skill)
+    
+    logger.info(f"Forecasted {skill}: {forecast['forecast'][:2]}")
+    
+    return {
+        'skill': skill,
+        'forecast': forecast['forecast'],
+        'explanation': explanation,
+        'method': forecast.get('method', 'ensemble')
+    }
+
+
+def batch_forecast_all_skills(db_session, forecast_periods: int = 6,
+                              max_workers: Optional[int] = None) -> List[Dict]:
     """
     Generate forecasts for all skills in database
+    Skills are independent, so they are fitted in parallel (one per core by default)
     """
-    from main import SkillTrend  # Import DB models
-    
-    forecaster = EnsembleForecaster()
-    explainer = ForecastExplainer()
+    from models import SkillTrend  # Import DB models
     
-    # Get all unique skills
-    skills = db_session.query(SkillTrend.skill.distinct()).all()
+    # One ordered read for every skill's history, split in memory
+    query = db_session.query(
+        SkillTrend.skill_name, SkillTrend.month, SkillTrend.job_count
+    ).order_by(SkillTrend.skill_name, SkillTrend.month)
+    df_all = pd.read_sql(query.statement, db_session.get_bind())
     
-    forecasts = []
+    data = {}
     
-    for (skill,) in skills:
-        # Get historical data
-        history = db_session.query(SkillTrend).filter(
-            SkillTrend.skill == skill
-        ).order_by(SkillTrend.month).all()
-        
-        if len(history) < 3:
+    for skill, sub in df_all.groupby('skill_name', sort=False):
+        if len(sub) < 3:
             logger.warning(f"Insufficient data for {skill}, skipping")
             continue
         
-        # Create series
-        series = pd.Series([h.count for h in history])
-        
-        # Forecast
-        forecast = forecaster.fit_forecast(series, periods=forecast_periods)
-        explanation = explainer.generate_explanation(forecast, series, skill)
-        
-        forecasts.append({
-            'skill': skill,
-            'forecast': forecast['forecast'],
-            'explanation': explanation,
-            'method': forecast.get('method', 'ensemble')
-        })
-        
-        logger.info(f"Forecasted {skill}: {forecast['forecast'][:2]}")
+        data[skill] = sub['job_count'].to_numpy(dtype=np.float64)
+    
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_forecast_worker) as executor:
+        futures = [
+            executor.submit(_forecast_one, skill, counts, forecast_periods)
+            for skill, counts in data.items()
+        ]
+        forecasts = [future.result() for future in futures]
     
     return forecasts
 
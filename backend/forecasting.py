@@ -4,11 +4,23 @@ Uses Prophet, XGBoost and Ensemble methods for job market forecasting
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from models import Job, Skill, JobSkill, Salary
+from sqlalchemy import func, extract, select, case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import Job, Skill, JobSkill, Salary, SkillTrend
 from typing import List, Dict, Tuple
+from cache import memoize
+from forecast_kernels import (
+    growth_rates, hotness_scores, hotness_scores_default, DEFAULT_HOTNESS_WEIGHTS,
+    linear_forecast, confidence
+)
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -30,11 +42,37 @@ except ImportError as e:
     print(f"[WARN] Advanced ML Models not available: {e}")
 
 
+@lru_cache(maxsize=32)
+def _month_labels(months: int, today_ordinal: int) -> Tuple[str, ...]:
+    """'%Y-%m' labels for `months` 30-day steps ending today (shared by every skill)"""
+    base_date = date.fromordinal(today_ordinal) - timedelta(days=30 * months)
+    return tuple(
+        (base_date + timedelta(days=30 * i)).strftime("%Y-%m")
+        for i in range(months)
+    )
+
+
+_VARIATION_ROWS = 4096
+
+
+@lru_cache(maxsize=8)
+def _variation_table(months: int) -> np.ndarray:
+    """+/- 20% monthly variation patterns, drawn in one PCG64 call and shared by all skills"""
+    table = np.random.default_rng(42).uniform(0.8, 1.2, size=(_VARIATION_ROWS, months))
+    table.flags.writeable = False
+    return table
+
+
 class JobForecaster:
     """Main forecasting class for job market predictions"""
     
+    FULL_MODEL_SKILLS = 5  # forecast_top_skills fits models only for this many skills
+    
     def __init__(self, db: Session):
         self.db = db
+        # Totals shared by every skill's score, loaded together on first use
+        self._max_jobs = None
+        self._overall_salary_avg = None
         
     def forecast_skill_demand(
         self, 
@@ -57,7 +95,26 @@ class JobForecaster:
         """
         # Get historical data
         historical = self._get_skill_historical_data(skill_name)
-        
+        counts = tuple(h['count'] for h in historical)
+        return self._cached_forecast(skill_name, counts, periods, use_ensemble)
+    
+    @memoize(ttl=3600)
+    def _cached_forecast(self, skill_name: str, counts: Tuple[int, ...], periods: int,
+                         use_ensemble: bool) -> Dict:
+        """
+        Forecast keyed by the history values themselves, so repeat requests
+        on unchanged data skip the Prophet/XGBoost fits
+        """
+        return self._forecast_history(skill_name, self._history_records(counts), periods, use_ensemble)
+    
+    def _forecast_history(
+        self,
+        skill_name: str,
+        historical: List[Dict],
+        periods: int,
+        use_ensemble: bool = True
+    ) -> Dict:
+        """Forecast from already-fetched history (see forecast_skill_demand)"""
         if len(historical) < 3:
             return {
                 "skill": skill_name,
@@ -67,16 +124,14 @@ class JobForecaster:
             }
         
         # Create time series
-        df = pd.DataFrame(historical)
-        df['date'] = pd.to_datetime(df['month'] + '-01')
-        df = df.sort_values('date')
+        df = self._history_frame(historical)
         
         # PRIORITY 1: Try Ensemble model (best accuracy)
         if use_ensemble and ML_MODELS_AVAILABLE:
             if len(historical) >= 6:
                 try:
                     print(f"[AI] Using Ensemble (Prophet + XGBoost) for {skill_name}")
-                    forecast = self._ensemble_forecast(df, periods)
+                    forecast = self._ensemble_forecast(df, periods, skill_name)
                     method = "Ensemble (Prophet + XGBoost)"
                     confidence = 97.0  # Ensemble has highest confidence
                     print(f"[OK] Ensemble forecast successful for {skill_name}")
@@ -126,39 +181,90 @@ class JobForecaster:
             "confidence": confidence
         }
     
-    def forecast_top_skills(self, top_n: int = 10, periods: int = 6) -> List[Dict]:
-        """Forecast demand for top N skills"""
-        # Get top skills
-        top_skills = self.db.query(
-            Skill.skill_name,
-            func.count(JobSkill.id).label('count')
-        ).join(JobSkill).group_by(Skill.id)\
-         .order_by(func.count(JobSkill.id).desc())\
-         .limit(top_n).all()
+    def _history_frame(self, historical: List[Dict]) -> pd.DataFrame:
+        """Historical records as a date-sorted DataFrame (month, count, date)"""
+        df = pd.DataFrame(historical)
+        df['count'] = df['count'].astype(np.int32)
+        df['date'] = pd.to_datetime(df['month'] + '-01', format='%Y-%m-%d')
+        return df.sort_values('date')
+    
+    def forecast_top_skills(self, top_n: int = 10, periods: int = 6,
+                            full_models: int = FULL_MODEL_SKILLS) -> List[Dict]:
+        """
+        Forecast demand for top N skills
+        Only the `full_models` largest skills get model fits; the long tail
+        uses the linear trend, which is near-free
+        """
+        # Get top skills with their volumes in one query
+        top_skills = self._skill_volumes(limit=top_n)
+        histories = self._synthetic_history(top_skills['skill'], top_skills['count'].to_numpy())
+        
+        forecasts = [None] * len(top_skills)
+        misses = []
+        for rank, (skill, counts) in enumerate(zip(top_skills['skill'], histories)):
+            if rank < full_models:
+                key = (skill, tuple(counts.tolist()), periods, True)
+                hit, forecasts[rank] = JobForecaster._cached_forecast.lookup(*key)
+                if not hit:
+                    misses.append((rank, key))
+            else:
+                forecasts[rank] = self._long_tail_forecast(skill, counts, periods)
+        
+        # Model fits are independent and CPU-bound - spread them over worker processes
+        if len(misses) > 1:
+            pool = _forecast_pool()
+            futures = [(rank, key, pool.submit(_forecast_skill_worker, *key)) for rank, key in misses]
+            for rank, key, future in futures:
+                forecasts[rank] = future.result()
+                JobForecaster._cached_forecast.store(forecasts[rank], *key)
+        else:
+            for rank, key in misses:
+                forecasts[rank] = self._cached_forecast(*key)
         
-        results = []
-        for skill, count in top_skills:
-            forecast = self.forecast_skill_demand(skill, periods)
-            if "error" not in forecast:
-                results.append(forecast)
+        results = [forecast for forecast in forecasts if "error" not in forecast]
         
         return results
     
+    def _long_tail_forecast(self, skill_name: str, counts: np.ndarray, periods: int) -> Dict:
+        """Linear-trend forecast for skills outside the top few"""
+        historical = self._history_records(counts)
+        if len(historical) < 3:
+            return self._forecast_history(skill_name, historical, periods)  # Error response
+        
+        return {
+            "skill": skill_name,
+            "historical": historical,
+            "forecast": self._simple_forecast(self._history_frame(historical), periods),
+            "method": "Statistical (long tail)",
+            "periods": periods,
+            "confidence": 70.0
+        }
+    
+    def skill_scores(self, skill_name: str) -> Tuple[int, float, float]:
+        """
+        (job_count, growth_rate, hotness) for one skill - a single indexed read
+        from the latest skill_trends month, or one live scoring pass if the
+        skill hasn't been scored yet
+        """
+        row = self.db.execute(
+            select(SkillTrend.job_count, SkillTrend.growth_rate, SkillTrend.hotness_score)
+            .where(SkillTrend.month == _latest_trend_month(), SkillTrend.skill_name == skill_name)
+            .limit(1)
+        ).first()
+        if row is not None:
+            return tuple(row)
+        
+        skills = pd.DataFrame({
+            'skill': [skill_name],
+            'count': [self._skill_volume(skill_name)]
+        })
+        scored = self._score_skills(skills).iloc[0]
+        return int(scored['count']), float(scored['growth_rate']), float(scored['hotness'])
+    
     def calculate_growth_rate(self, skill_name: str) -> float:
         """Calculate growth rate for a skill (last 3 months vs previous 3 months)"""
-        historical = self._get_skill_historical_data(skill_name, months=6)
-        
-        if len(historical) < 6:
-            return 0.0
-        
-        recent = sum([h['count'] for h in historical[-3:]])
-        previous = sum([h['count'] for h in historical[:3]])
-        
-        if previous == 0:
-            return 100.0
-        
-        growth = ((recent - previous) / previous) * 100
-        return round(growth, 2)
+        volume = self._skill_volume(skill_name)
+        return float(self._growth_rates([skill_name], np.array([volume]))[0])
     
     def calculate_hotness_score(
         self, 
@@ -180,109 +286,88 @@ class JobForecaster:
             gamma: Weight for salary premium
             delta: Weight for demand/supply ratio
         """
-        # Get job volume
-        volume = self.db.query(func.count(JobSkill.id))\
-            .join(Skill)\
-            .filter(Skill.skill_name == skill_name).scalar() or 0
-        
-        # Get growth rate
-        growth = self.calculate_growth_rate(skill_name)
-        
-        # Get salary premium
-        salary_premium = self._calculate_salary_premium(skill_name)
-        
-        # Calculate demand score
-        demand_score = self._calculate_demand_score(skill_name)
-        
-        # Normalize values to 0-100 scale
-        volume_norm = min(100, (volume / 100) * 100)  # Assume 100 jobs = 100%
-        growth_norm = min(100, max(0, growth + 50))  # -50% to +50% → 0 to 100
-        salary_norm = min(100, salary_premium)
-        demand_norm = min(100, demand_score)
-        
-        # Calculate weighted hotness
-        hotness = (
-            alpha * volume_norm +
-            beta * growth_norm +
-            gamma * salary_norm +
-            delta * demand_norm
-        )
-        
-        return round(hotness, 2)
+        skills = pd.DataFrame({
+            'skill': [skill_name],
+            'count': [self._skill_volume(skill_name)]
+        })
+        scored = self._score_skills(skills, alpha, beta, gamma, delta)
+        return float(scored['hotness'].iloc[0])
     
     def get_trending_skills(self, limit: int = 20, min_growth: float = 10.0) -> List[Dict]:
-        """Get skills that are trending (high growth rate)"""
-        # Get all skills with sufficient data
-        skills = self.db.query(
-            Skill.skill_name,
-            func.count(JobSkill.id).label('count')
-        ).join(JobSkill).group_by(Skill.id)\
-         .having(func.count(JobSkill.id) >= 10)\
-         .all()
-        
-        trending = []
-        for skill_name, count in skills:
-            growth = self.calculate_growth_rate(skill_name)
-            
-            if growth >= min_growth:
-                hotness = self.calculate_hotness_score(skill_name)
-                trending.append({
-                    "skill": skill_name,
-                    "count": count,
-                    "growth_rate": growth,
-                    "hotness": hotness,
-                    "trend": "HOT" if growth > 30 else "UP" if growth > 20 else "RISING"
-                })
-        
-        # Sort by growth rate
-        trending.sort(key=lambda x: x['growth_rate'], reverse=True)
-        return trending[:limit]
+        """Get skills that are trending (high growth rate) - read from skill_trends"""
+        rows = self.db.execute(
+            select(
+                SkillTrend.skill_name.label('skill'),
+                SkillTrend.job_count.label('count'),
+                SkillTrend.growth_rate,
+                SkillTrend.hotness_score.label('hotness'),
+                case(
+                    (SkillTrend.growth_rate > 30, "HOT"),
+                    (SkillTrend.growth_rate > 20, "UP"),
+                    else_="RISING"
+                ).label('trend')
+            )
+            .where(SkillTrend.month == _latest_trend_month())
+            .where(SkillTrend.job_count >= 10, SkillTrend.growth_rate >= min_growth)
+            .order_by(SkillTrend.growth_rate.desc())
+            .limit(limit)
+        ).mappings().all()
+        
+        return [dict(row) for row in rows]
     
     def predict_salary_trend(self, skill_name: str, periods: int = 6) -> Dict:
         """Predict salary trends for a skill"""
-        # Get salary history
-        salaries = self.db.query(
-            Salary.med_salary
-        ).join(Job).join(JobSkill).join(Skill)\
-         .filter(Skill.skill_name == skill_name)\
-         .filter(Salary.med_salary.isnot(None)).all()
-        
-        if not salaries:
+        # Get salary history straight into an array
+        salaries = self.db.execute(
+            select(Salary.med_salary)
+            .join(Job).join(JobSkill).join(Skill)
+            .where(Skill.skill_name == skill_name)
+            .where(Salary.med_salary.isnot(None)),
+            execution_options={"yield_per": 10000}
+        ).scalars()
+        salary_values = np.fromiter(salaries, dtype=np.float64)
+        
+        if not salary_values.size:
             return {
                 "skill": skill_name,
                 "error": "No salary data available"
             }
         
-        salary_values = [s[0] for s in salaries if s[0]]
+        salary_values = salary_values[salary_values != 0]
         
-        if not salary_values:
+        if not salary_values.size:
             return {
                 "skill": skill_name,
                 "error": "No valid salary data"
             }
         
-        current_avg = np.mean(salary_values)
+        current_avg = salary_values.mean()
         current_median = np.median(salary_values)
-        current_std = np.std(salary_values)
+        current_std = salary_values.std()
         
         # Simple linear trend
         growth_rate = 0.02  # Assume 2% monthly growth
-        predictions = []
-        
-        for i in range(1, periods + 1):
-            predicted = current_avg * (1 + growth_rate * i)
-            predictions.append({
+        steps = np.arange(1, periods + 1)
+        trend = current_avg * (1 + growth_rate * steps)
+        predicted = np.round(trend, 2)
+        lower = np.round(trend - current_std, 2)
+        upper = np.round(trend + current_std, 2)
+        
+        predictions = [
+            {
                 "period": i,
-                "predicted_salary": round(predicted, 2),
-                "confidence_low": round(predicted - current_std, 2),
-                "confidence_high": round(predicted + current_std, 2)
-            })
+                "predicted_salary": p,
+                "confidence_low": lo,
+                "confidence_high": hi
+            }
+            for i, p, lo, hi in zip(steps.tolist(), predicted.tolist(), lower.tolist(), upper.tolist())
+        ]
         
         return {
             "skill": skill_name,
-            "current_average": round(current_avg, 2),
-            "current_median": round(current_median, 2),
-            "std_deviation": round(current_std, 2),
+            "current_average": round(float(current_avg), 2),
+            "current_median": round(float(current_median), 2),
+            "std_deviation": round(float(current_std), 2),
             "predictions": predictions
         }
     
@@ -295,80 +380,209 @@ class JobForecaster:
         # Note: Since we don't have timestamp data, we'll create synthetic monthly data
         # based on job_id distribution
         
-        total_count = self.db.query(func.count(JobSkill.id))\
-            .join(Skill)\
+        return self._bulk_historical([skill_name], months)[skill_name]
+    
+    def _bulk_historical(self, skills: List[str], months: int = 12) -> Dict[str, List[Dict]]:
+        """Historical data for many skills: one grouped count query, one history matrix"""
+        volumes = dict(
+            self.db.query(Skill.skill_name, func.sum(Skill.cached_job_count))
+            .filter(Skill.skill_name.in_(skills))
+            .group_by(Skill.skill_name).all()
+        )
+        
+        present = [skill for skill in skills if volumes.get(skill)]
+        totals = np.array([volumes[skill] for skill in present], dtype=np.float64)
+        histories = self._synthetic_history(present, totals, months)
+        
+        historical = {skill: [] for skill in skills}  # No jobs, no history
+        for skill, counts in zip(present, histories):
+            historical[skill] = self._history_records(counts)
+        return historical
+    
+    def _synthetic_history(self, skill_names, totals: np.ndarray, months: int = 12) -> np.ndarray:
+        """
+        Synthetic monthly counts for many skills at once: shape (len(totals), months).
+        Each month is total / months with +/- 20% variation, picked from a shared
+        table by skill name hash so a skill's history (and its cached forecast)
+        is stable between requests.
+        In production, you'd query actual posted_date from jobs
+        """
+        totals = np.asarray(totals, dtype=np.float64)
+        rows = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(str(skill_name).encode(), digest_size=8).digest(), 'little')
+             % _VARIATION_ROWS for skill_name in skill_names),
+            dtype=np.int64, count=len(totals)
+        )
+        variation = _variation_table(months)[rows]
+        return ((totals[:, None] / months) * variation).astype(np.int32)  # Monthly counts fit easily
+    
+    def _history_records(self, counts: np.ndarray) -> List[Dict]:
+        """Label a row of monthly counts with its months, oldest first"""
+        labels = _month_labels(len(counts), date.today().toordinal())
+        
+        return [
+            {"month": month, "count": int(count)}
+            for month, count in zip(labels, counts)
+        ]
+    
+    def _growth_rates(self, skill_names, totals: np.ndarray) -> np.ndarray:
+        """Growth (last 3 months vs previous 3) over 6 synthetic months, per skill"""
+        totals = np.asarray(totals, dtype=np.float64)
+        history = self._synthetic_history(skill_names, totals, months=6)
+        return np.round(growth_rates(history.astype(np.float64), totals), 2)
+    
+    def _skill_volume(self, skill_name: str) -> int:
+        """Job count for one skill (precomputed on the skill row)"""
+        return self.db.query(func.sum(Skill.cached_job_count))\
             .filter(Skill.skill_name == skill_name).scalar() or 0
+    
+    def _skill_volumes(self, limit: int = None, min_count: int = None) -> pd.DataFrame:
+        """Job count per skill, largest first - read from the precomputed counts"""
+        query = select(
+            Skill.skill_name,
+            Skill.cached_job_count
+        ).where(Skill.cached_job_count >= (min_count or 1))
+        
+        query = query.order_by(Skill.cached_job_count.desc())
+        if limit is not None:
+            query = query.limit(limit)
         
-        if total_count == 0:
-            return []
+        return pd.DataFrame(self.db.execute(query).all(), columns=['skill', 'count'])
+    
+    def _score_skills(
+        self,
+        skills: pd.DataFrame,
+        alpha: float = 0.3,
+        beta: float = 0.3,
+        gamma: float = 0.2,
+        delta: float = 0.2
+    ) -> pd.DataFrame:
+        """
+        Add growth_rate and hotness columns to a (skill, count) frame.
+        Salary averages come from one grouped query; the overall average and
+        the top skill count are fetched once per forecaster.
+        """
+        skills = skills.copy()
+        volume = skills['count'].to_numpy(dtype=np.float64)
+        
+        growth = self._growth_rates(skills['skill'], volume)
+        
+        # Salary premium
+        overall_avg = self._get_overall_salary_avg()
+        skill_avg = skills['skill'].map(self._skill_avg_salaries(skills['skill'].tolist()))
+        skill_avg = skill_avg.to_numpy(dtype=np.float64, na_value=np.nan)
+        if overall_avg:
+            premium = (skill_avg - overall_avg) / overall_avg * 100
+            salary_premium = np.clip(50 + premium / 2, 0, 100)  # -100% to +100% → 0 to 100
+            salary_premium = np.where(np.isnan(salary_premium) | (skill_avg == 0), 50.0, salary_premium)
+        else:
+            salary_premium = np.full(len(skills), 50.0)  # Neutral
         
-        # Generate synthetic monthly data
-        # In production, you'd query actual posted_date from jobs
-        base_date = datetime.now() - timedelta(days=30 * months)
-        historical = []
+        # Demand score
+        max_count = self._get_max_jobs()
+        demand_score = np.round(volume / max_count * 100, 2) if max_count > 0 else np.zeros(len(skills))
         
-        for i in range(months):
-            month_date = base_date + timedelta(days=30 * i)
-            # Add some variation (+/- 20%)
-            variation = np.random.uniform(0.8, 1.2)
-            count = int((total_count / months) * variation)
-            
-            historical.append({
-                "month": month_date.strftime("%Y-%m"),
-                "count": count
-            })
+        # Weighted hotness over 0-100 normalized components
+        salary_premium = np.asarray(salary_premium, dtype=np.float64)
+        demand_score = np.asarray(demand_score, dtype=np.float64)
+        if (alpha, beta, gamma, delta) == DEFAULT_HOTNESS_WEIGHTS:
+            hotness = hotness_scores_default(volume, growth, salary_premium, demand_score)
+        else:
+            hotness = hotness_scores(volume, growth, salary_premium, demand_score,
+                                     alpha, beta, gamma, delta)
         
-        return historical
+        skills['growth_rate'] = growth
+        skills['hotness'] = np.round(hotness, 2)
+        return skills
+    
+    def _skill_avg_salaries(self, skill_names: List[str]) -> Dict[str, float]:
+        """Average median salary per skill, for many skills in one query"""
+        rows = self.db.query(Skill.skill_name, func.avg(Salary.med_salary))\
+            .select_from(Salary).join(Job).join(JobSkill).join(Skill)\
+            .filter(Skill.skill_name.in_(skill_names))\
+            .filter(Salary.med_salary.isnot(None))\
+            .group_by(Skill.skill_name).all()
+        return dict(rows)
+    
+    @memoize(ttl=3600)
+    def _totals(self) -> Tuple[float, int]:
+        """
+        Overall average salary and largest skill job count, in one round trip -
+        shared by every forecaster until the data changes
+        """
+        avg_salary = select(func.avg(Salary.med_salary))\
+            .where(Salary.med_salary.isnot(None)).scalar_subquery()
+        max_jobs = select(func.max(Skill.cached_job_count)).scalar_subquery()
+        
+        return tuple(self.db.execute(select(avg_salary, max_jobs)).one())
+    
+    def _load_totals(self):
+        self._overall_salary_avg, max_jobs = self._totals()
+        self._max_jobs = max_jobs or 1
+    
+    def _get_overall_salary_avg(self) -> float:
+        """Overall average salary (queried once per forecaster)"""
+        if self._max_jobs is None:
+            self._load_totals()
+        return self._overall_salary_avg
+    
+    def _get_max_jobs(self) -> int:
+        """Largest job count of any skill (queried once per forecaster)"""
+        if self._max_jobs is None:
+            self._load_totals()
+        return self._max_jobs
     
     def _prophet_forecast(self, df: pd.DataFrame, periods: int) -> List[Dict]:
         """Use Prophet for forecasting"""
         # Prepare data for Prophet
-        prophet_df = df[['date', 'count']].rename(columns={'date': 'ds', 'count': 'y'})
+        prophet_df = df[['date', 'count']].rename(columns={'date': 'ds', 'count': 'y'})\
+            .astype({'y': np.float64})  # Counts are stored as int32; Prophet fits in float64
         
-        # Create and fit model
+        # Create and fit model - bounds are computed from residuals below,
+        # so skip Prophet's Monte Carlo uncertainty simulation
         model = Prophet(
             yearly_seasonality=False,
             weekly_seasonality=False,
             daily_seasonality=False,
-            changepoint_prior_scale=0.05
+            changepoint_prior_scale=0.05,
+            uncertainty_samples=0
         )
-        
         model.fit(prophet_df)
         
         # Make future dataframe
         future = model.make_future_dataframe(periods=periods, freq='MS')
         forecast = model.predict(future)
         
-        # Extract predictions
-        predictions = []
-        forecast_only = forecast.tail(periods)
+        # 95% band from the in-sample residuals
+        yhat = forecast['yhat'].to_numpy()
+        residual_std = np.std(prophet_df['y'].to_numpy() - yhat[:len(prophet_df)])
+        forecast_only = forecast.iloc[-periods:]
+        future_yhat = yhat[-periods:]
+        lower = future_yhat - 1.96 * residual_std
+        upper = future_yhat + 1.96 * residual_std
         
-        for _, row in forecast_only.iterrows():
-            predictions.append({
-                "month": row['ds'].strftime("%Y-%m"),
-                "predicted_count": max(0, int(row['yhat'])),
-                "lower_bound": max(0, int(row['yhat_lower'])),
-                "upper_bound": max(0, int(row['yhat_upper']))
-            })
-        
-        return predictions
+        # Extract predictions
+        return [
+            {
+                "month": ds.strftime("%Y-%m"),
+                "predicted_count": max(0, int(y)),
+                "lower_bound": max(0, int(lo)),
+                "upper_bound": max(0, int(hi))
+            }
+            for ds, y, lo, hi in zip(forecast_only['ds'], future_yhat, lower, upper)
+        ]
     
     def _simple_forecast(self, df: pd.DataFrame, periods: int) -> List[Dict]:
         """Simple statistical forecast (fallback when Prophet unavailable)"""
         # Calculate trend using linear regression
-        x = np.arange(len(df))
-        y = df['count'].values
-        
-        # Simple linear fit
-        z = np.polyfit(x, y, 1)
-        p = np.poly1d(z)
+        trend = linear_forecast(df['count'].to_numpy(np.float64), periods)
         
         predictions = []
         last_date = df['date'].max()
         
         for i in range(1, periods + 1):
             future_date = last_date + timedelta(days=30 * i)
-            predicted_value = max(0, int(p(len(df) + i - 1)))
+            predicted_value = max(0, int(trend[i - 1]))
             
             # Add confidence interval (±20%)
             predictions.append({
@@ -382,73 +596,22 @@ class JobForecaster:
     
     def _calculate_confidence(self, df: pd.DataFrame) -> float:
         """Calculate forecast confidence based on data quality"""
-        if len(df) < 3:
-            return 0.0
-        
-        # More data = higher confidence
-        data_confidence = min(1.0, len(df) / 12) * 100
-        
-        # Lower variance = higher confidence
-        cv = df['count'].std() / df['count'].mean() if df['count'].mean() > 0 else 1
-        variance_confidence = max(0, (1 - cv)) * 100
-        
-        # Average confidence
-        confidence = (data_confidence + variance_confidence) / 2
-        return round(confidence, 2)
-    
-    def _calculate_salary_premium(self, skill_name: str) -> float:
-        """Calculate salary premium compared to average"""
-        # Get average salary for this skill
-        skill_avg = self.db.query(func.avg(Salary.med_salary))\
-            .join(Job).join(JobSkill).join(Skill)\
-            .filter(Skill.skill_name == skill_name)\
-            .filter(Salary.med_salary.isnot(None)).scalar()
-        
-        # Get overall average salary
-        overall_avg = self.db.query(func.avg(Salary.med_salary))\
-            .filter(Salary.med_salary.isnot(None)).scalar()
-        
-        if not skill_avg or not overall_avg or overall_avg == 0:
-            return 50.0  # Neutral
-        
-        # Calculate premium as percentage above average
-        premium = ((skill_avg - overall_avg) / overall_avg) * 100
-        
-        # Normalize to 0-100 scale
-        normalized = 50 + (premium / 2)  # -100% to +100% → 0 to 100
-        return min(100, max(0, normalized))
-    
-    def _calculate_demand_score(self, skill_name: str) -> float:
-        """Calculate demand score based on job postings"""
-        # Get job count for this skill
-        skill_jobs = self.db.query(func.count(JobSkill.id))\
-            .join(Skill)\
-            .filter(Skill.skill_name == skill_name).scalar() or 0
-        
-        # Get max job count across all skills
-        max_jobs = self.db.query(func.count(JobSkill.id))\
-            .group_by(JobSkill.skill_abr)\
-            .order_by(func.count(JobSkill.id).desc())\
-            .first()
-        
-        max_count = max_jobs[0] if max_jobs else 1
-        
-        # Normalize to 0-100
-        demand = (skill_jobs / max_count) * 100 if max_count > 0 else 0
-        return round(demand, 2)
+        # More data and lower variance = higher confidence
+        return round(float(confidence(df['count'].to_numpy(np.float64))), 2)
     
-    def _ensemble_forecast(self, df: pd.DataFrame, periods: int) -> List[Dict]:
+    def _ensemble_forecast(self, df: pd.DataFrame, periods: int, skill_name: str = None) -> List[Dict]:
         """
         Use Ensemble model (Prophet + XGBoost) for best accuracy
         """
         # Prepare series data
-        series = pd.Series(df['count'].values)
+        series = pd.Series(df['count'].to_numpy(dtype=np.float32))  # XGBoost trains on float32
         
-        # Create ensemble forecaster
-        ensemble = EnsembleForecaster()
+        # Create ensemble forecaster - single-threaded, since this runs in one of
+        # several pool workers (set explicitly, numpy/xgboost are already loaded)
+        ensemble = EnsembleForecaster(n_jobs=1)
         
         # Fit and forecast
-        result = ensemble.fit_forecast(series, periods=periods)
+        result = ensemble.fit_forecast(series, periods=periods, skill=skill_name)
         
         # Get last date
         last_date = df['date'].max()
@@ -461,8 +624,10 @@ class JobForecaster:
             # Get confidence bounds from Prophet if available
             if result.get('prophet') and result['prophet']:
                 prophet_data = result['prophet']
-                lower = prophet_data.get('lower', [])[i-1] if i-1 < len(prophet_data.get('lower', [])) else int(pred_value * 0.8)
-                upper = prophet_data.get('upper', [])[i-1] if i-1 < len(prophet_data.get('upper', [])) else int(pred_value * 1.2)
+                lower = prophet_data.get('lower', [])
+                upper = prophet_data.get('upper', [])
+                lower = lower[i-1] if i-1 < len(lower) else int(pred_value * 0.8)
+                upper = upper[i-1] if i-1 < len(upper) else int(pred_value * 1.2)
             else:
                 # Use ±20% as confidence interval
                 lower = int(pred_value * 0.8)
@@ -478,6 +643,54 @@ class JobForecaster:
         return forecast_list
 
 
+# ========================================
+# Worker Pool
+# ========================================
+
+_pool = None
+# Every uvicorn worker (API_WORKERS) runs its own pool, so split the cores between them
+_POOL_WORKERS = min(
+    JobForecaster.FULL_MODEL_SKILLS,
+    max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("API_WORKERS", "1"))))
+)
+
+
+def _forecast_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all requests (workers keep their imports warm)"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=_POOL_WORKERS,
+            # Started from the API process, which already runs the event loop and
+            # aiosqlite threads - don't fork that state into the workers
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _pool
+
+
+def start_forecast_pool():
+    """Spawn every worker up front (app startup) so the first forecast request doesn't pay for it"""
+    pool = _forecast_pool()
+    for future in [pool.submit(os.getpid) for _ in range(_POOL_WORKERS)]:
+        future.result()
+
+
+def shutdown_forecast_pool():
+    """Stop the worker processes (app shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def _forecast_skill_worker(skill_name: str, counts: Tuple[int, ...], periods: int,
+                           use_ensemble: bool) -> Dict:
+    """Forecast one skill's history in a worker process (no DB access needed)"""
+    forecaster = JobForecaster(None)
+    historical = forecaster._history_records(counts)
+    return forecaster._forecast_history(skill_name, historical, periods, use_ensemble)
+
+
 # ========================================
 # Convenience Functions
 # ========================================
@@ -493,31 +706,86 @@ def quick_forecast(db: Session, skill_name: str, periods: int = 6) -> Dict:
     return forecaster.forecast_skill_demand(skill_name, periods)
 
 
+async def quick_forecast_async(db: Session, skill_name: str, periods: int = 6) -> Dict:
+    """
+    quick_forecast for async endpoints - the history query runs in a thread
+    and the model fit in the worker pool, so neither blocks the event loop
+    (only plain values are sent to the pool, the session stays here)
+    """
+    loop = asyncio.get_running_loop()
+    forecaster = JobForecaster(db)
+    historical = await loop.run_in_executor(None, forecaster._get_skill_historical_data, skill_name)
+    key = (skill_name, tuple(h['count'] for h in historical), periods, True)
+    
+    hit, result = JobForecaster._cached_forecast.lookup(*key)
+    if not hit:
+        result = await loop.run_in_executor(_forecast_pool(), _forecast_skill_worker, *key)
+        JobForecaster._cached_forecast.store(result, *key)
+    return result
+
+
+def _latest_trend_month():
+    """Most recent month in skill_trends, as a scalar subquery"""
+    return select(func.max(SkillTrend.month)).scalar_subquery()
+
+
+def recompute_skill_trends(db: Session) -> int:
+    """
+    Score every skill and upsert this month's skill_trends rows, so the
+    hotness/trending endpoints read one indexed row instead of aggregating
+    (run after ETL and at startup)
+    """
+    forecaster = JobForecaster(db)
+    scored = forecaster._score_skills(forecaster._skill_volumes())
+    
+    month = date.today().strftime("%Y-%m")
+    now = datetime.utcnow()
+    rows = [
+        {
+            "skill_name": skill,
+            "month": month,
+            "job_count": int(count),
+            "growth_rate": float(growth),
+            "hotness_score": float(hotness),
+            "updated_at": now
+        }
+        for skill, count, growth, hotness in zip(
+            scored['skill'], scored['count'], scored['growth_rate'], scored['hotness']
+        )
+    ]
+    
+    if rows:
+        stmt = sqlite_insert(SkillTrend.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['skill_name', 'month'],
+            set_={
+                column: stmt.excluded[column]
+                for column in ('job_count', 'growth_rate', 'hotness_score', 'updated_at')
+            }
+        )
+        db.execute(stmt, rows)
+    db.commit()
+    return len(rows)
+
+
 def get_hottest_skills(db: Session, limit: int = 20) -> List[Dict]:
     """Get hottest skills with scores"""
     forecaster = JobForecaster(db)
     
-    # Get top skills by volume
-    top_skills = db.query(
-        Skill.skill_name,
-        func.count(JobSkill.id).label('count')
-    ).join(JobSkill).group_by(Skill.id)\
-     .order_by(func.count(JobSkill.id).desc())\
-     .limit(limit * 2).all()  # Get more to filter
+    # Get top skills by volume, scored in bulk
+    top_skills = forecaster._skill_volumes(limit=limit * 2)  # Get more to filter
+    scored = forecaster._score_skills(top_skills)
     
-    results = []
-    for skill_name, count in top_skills:
-        hotness = forecaster.calculate_hotness_score(skill_name)
-        growth = forecaster.calculate_growth_rate(skill_name)
-        
-        results.append({
-            "skill": skill_name,
-            "count": count,
-            "hotness": hotness,
-            "growth_rate": growth,
-            "rating": "***" if hotness > 80 else "**" if hotness > 60 else "*"
-        })
+    # Top `limit` by hotness: partial selection, then sort just those
+    hotness = scored['hotness'].to_numpy()
+    if limit < len(hotness):
+        top = np.sort(np.argpartition(-hotness, limit - 1)[:limit])
+    else:
+        top = np.arange(len(hotness))
+    top = top[np.argsort(-hotness[top], kind='stable')]
+    
+    scored = scored.iloc[top]
+    hotness = hotness[top]
+    scored = scored.assign(rating=np.select([hotness > 80, hotness > 60], ["***", "**"], "*"))
     
-    # Sort by hotness
-    results.sort(key=lambda x: x['hotness'], reverse=True)
-    return results[:limit]
+    return scored[['skill', 'count', 'hotness', 'growth_rate', 'rating']].to_dict('records')
@@ -2,27 +2,48 @@
 FastAPI Main Application
 Simple backend for job forecaster demo
 """
+import os
+import asyncio
+
+# One OpenMP thread per process (set before numpy/xgboost load) - the
+# models predict a row at a time, so scale out with uvicorn workers instead
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+import numpy as np
 from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
+from typing import Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
-from database import get_db, init_db
-from models import Job, Company, Salary, Skill, JobSkill, Industry, Benefit
-from forecasting import get_forecaster, get_hottest_skills, quick_forecast
+from cache import memoize
+from database import get_db, get_async_db, SessionLocal, async_engine
+from models import Job, Company, Salary, Skill, JobSkill, Industry, Benefit, OccupationCount, SkillTrend
+from forecasting import (
+    get_forecaster, get_hottest_skills, quick_forecast_async, start_forecast_pool,
+    shutdown_forecast_pool
+)
 from analytics import get_analytics
+from etl_load_data import prepare_database
 from datetime import datetime
 import uvicorn
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    init_db()
-    print("[OK] Database initialized")
+    # Startup (per worker): warm-up only - migrations run once in prepare_database()
+    db = SessionLocal()
+    try:
+        skill_lookup(db)  # Warm the in-memory skill map
+    finally:
+        db.close()
+    start_forecast_pool()
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    shutdown_forecast_pool()
+    await async_engine.dispose()
     print("[INFO] Shutting down...")
 
 # Create FastAPI app
@@ -30,7 +51,8 @@ app = FastAPI(
     title="Job Forecaster API",
     description="API for job market analysis and forecasting",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS - Allow frontend to connect
@@ -61,6 +83,51 @@ def health_check():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+def fetch_page(db: Session, stmt, offset: int, limit: int, total: Optional[int] = None):
+    """
+    One page of rows (as mappings, without the count) plus the total number
+    of matches - a single query using COUNT(*) OVER ()
+    Pass `total` when it is already known to skip the window count.
+    """
+    if total is not None:
+        rows = db.execute(stmt.offset(offset).limit(limit)).mappings().all()
+        return [dict(row) for row in rows], total
+    
+    rows = db.execute(
+        stmt.add_columns(func.count().over().label('_total')).offset(offset).limit(limit)
+    ).mappings().all()
+    
+    if rows:
+        total = rows[0]['_total']
+    elif offset:
+        # Page past the end: no rows to carry the window count
+        total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+    else:
+        total = 0
+    
+    return [{k: v for k, v in row.items() if k != '_total'} for row in rows], total
+
+
+@memoize(ttl=300)
+def count_active_jobs(db: Session) -> int:
+    """Active job count, shared by every request until the data changes"""
+    return db.execute(select(func.count(Job.id)).where(Job.is_active == True)).scalar()
+
+@memoize(ttl=3600)
+def skill_lookup(db: Session) -> Dict[str, Tuple[int, str]]:
+    """lower(skill_name) -> (id, skill_name) for the whole (small) skills table"""
+    return {
+        name.lower(): (skill_id, name)
+        for skill_id, name in db.execute(select(Skill.id, Skill.skill_name)).all()
+        if name
+    }
+
+
+def resolve_skill(db: Session, skill_name: str) -> str:
+    """Stored spelling of a skill name, matched case-insensitively in memory"""
+    entry = skill_lookup(db).get(skill_name.lower())
+    return entry[1] if entry else skill_name
+
 # ============================================
 # JOBS ENDPOINTS
 # ============================================
@@ -75,58 +142,49 @@ def search_jobs(
 ):
     """Search jobs with filters"""
     
-    jobs_query = db.query(Job).filter(Job.is_active == True)
+    filters = [Job.is_active == True]
     
     if query:
-        jobs_query = jobs_query.filter(
-            Job.title.ilike(f"%{query}%")
-        )
+        filters.append(Job.title.ilike(f"%{query}%"))
     
     if location:
-        jobs_query = jobs_query.filter(
-            Job.location.ilike(f"%{location}%")
-        )
-    
-    total = jobs_query.count()
-    jobs = jobs_query.offset(offset).limit(limit).all()
-    
-    return {
+        filters.append(Job.location.ilike(f"%{location}%"))
+    
+    # Only the listed columns - no ORM entities, no job descriptions
+    # (an unfiltered search reuses the shared active-job count instead of
+    # counting every active job again for each page)
+    jobs, total = fetch_page(
+        db,
+        select(Job.job_id, Job.title, Job.company_id, Job.location,
+               Job.city, Job.state, Job.work_type).where(*filters),
+        offset, limit,
+        total=None if query or location else count_active_jobs(db)
+    )
+    
+    return ORJSONResponse({
         "total": total,
         "limit": limit,
         "offset": offset,
-        "results": [
-            {
-                "job_id": job.job_id,
-                "title": job.title,
-                "company_id": job.company_id,
-                "location": job.location,
-                "city": job.city,
-                "state": job.state,
-                "work_type": job.work_type
-            }
-            for job in jobs
-        ]
-    }
+        "results": jobs
+    })
 
 @app.get("/api/jobs/{job_id}")
 def get_job_detail(job_id: str, db: Session = Depends(get_db)):
     """Get detailed job information"""
     
-    job = db.query(Job).filter(Job.job_id == job_id).first()
+    # Salary, skills and benefits load with one IN query each alongside the job
+    job = db.query(Job).options(
+        selectinload(Job.salaries),
+        selectinload(Job.skills),
+        selectinload(Job.benefits)
+    ).filter(Job.job_id == job_id).first()
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get salary
-    salary = db.query(Salary).filter(Salary.job_id == job_id).first()
-    
-    # Get skills
-    skills = db.query(Skill).join(JobSkill).filter(
-        JobSkill.job_id == job_id
-    ).all()
-    
-    # Get benefits
-    benefits = db.query(Benefit).filter(Benefit.job_id == job_id).all()
+    salary = job.salaries[0] if job.salaries else None
+    skills = job.skills
+    benefits = job.benefits
     
     return {
         "job_id": job.job_id,
@@ -158,21 +216,18 @@ def get_top_skills(
     """Get top skills by demand"""
     
     # Count jobs per skill
-    skill_counts = db.query(
-        Skill.skill_name,
-        Skill.skill_abr,
-        func.count(JobSkill.id).label('count')
-    ).join(JobSkill).group_by(Skill.id).order_by(desc('count')).limit(limit).all()
+    skill_counts = db.execute(
+        select(
+            Skill.skill_name.label('skill'),
+            Skill.skill_abr.label('code'),
+            Skill.cached_job_count.label('count'),
+            func.min(100, Skill.cached_job_count // 10).label('hotness')  # Simple hotness calculation
+        )
+        .where(Skill.cached_job_count > 0)
+        .order_by(Skill.cached_job_count.desc()).limit(limit)
+    ).mappings().all()
     
-    return [
-        {
-            "skill": skill.skill_name,
-            "code": skill.skill_abr,
-            "count": skill.count,
-            "hotness": min(100, int(skill.count / 10))  # Simple hotness calculation
-        }
-        for skill in skill_counts
-    ]
+    return ORJSONResponse([dict(skill) for skill in skill_counts])
 
 @app.get("/api/skills/trending")
 def get_trending_skills(limit: int = 20, db: Session = Depends(get_db)):
@@ -190,46 +245,39 @@ def get_salaries_by_skill(
 ):
     """Get salary statistics by skill"""
     
-    query = db.query(
-        Skill.skill_name,
-        func.avg(Salary.med_salary).label('avg_salary'),
+    query = select(
+        Skill.skill_name.label('skill'),
+        func.round(func.avg(Salary.med_salary), 2).label('avg_salary'),
         func.min(Salary.min_salary).label('min_salary'),
         func.max(Salary.max_salary).label('max_salary'),
-        func.count(Salary.id).label('count')
-    ).join(JobSkill, Skill.skill_abr == JobSkill.skill_abr)\
+        func.count(Salary.id).label('job_count')
+    ).join(JobSkill, Skill.id == JobSkill.skill_id)\
      .join(Salary, JobSkill.job_id == Salary.job_id)\
-     .filter(Salary.med_salary.isnot(None))\
+     .where(Salary.med_salary.isnot(None))\
      .group_by(Skill.skill_name)
     
     if skill:
-        query = query.filter(Skill.skill_name.ilike(f"%{skill}%"))
+        query = query.where(Skill.skill_name.ilike(f"%{skill}%"))
     
-    results = query.order_by(desc('avg_salary')).limit(50).all()
+    results = db.execute(query.order_by(desc('avg_salary')).limit(50)).mappings().all()
     
-    return [
-        {
-            "skill": r.skill_name,
-            "avg_salary": round(r.avg_salary, 2) if r.avg_salary else None,
-            "min_salary": r.min_salary,
-            "max_salary": r.max_salary,
-            "job_count": r.count
-        }
-        for r in results
-    ]
+    return ORJSONResponse([dict(r) for r in results])
 
 @app.get("/api/salaries/statistics")
 def get_salary_statistics(db: Session = Depends(get_db)):
     """Get overall salary statistics"""
     
-    stats = db.query(
-        func.avg(Salary.med_salary).label('avg'),
-        func.min(Salary.min_salary).label('min'),
-        func.max(Salary.max_salary).label('max'),
-        func.count(Salary.id).label('count')
-    ).filter(Salary.med_salary.isnot(None)).first()
+    stats = db.execute(
+        select(
+            func.round(func.avg(Salary.med_salary), 2).label('avg'),
+            func.min(Salary.min_salary).label('min'),
+            func.max(Salary.max_salary).label('max'),
+            func.count(Salary.id).label('count')
+        ).where(Salary.med_salary.isnot(None))
+    ).one()
     
     return {
-        "average": round(stats.avg, 2) if stats.avg else None,
+        "average": stats.avg or None,
         "minimum": stats.min,
         "maximum": stats.max,
         "total_records": stats.count
@@ -246,23 +294,15 @@ def get_companies(
     db: Session = Depends(get_db)
 ):
     """Get all companies"""
-    total = db.query(Company).count()
-    companies = db.query(Company).offset(offset).limit(limit).all()
+    companies = db.execute(
+        select(
+            Company.company_id, Company.name, Company.description, Company.city,
+            Company.state, Company.company_size, Company.employee_count,
+            Company.follower_count, Company.url
+        ).offset(offset).limit(limit)
+    ).mappings().all()
     
-    return [
-        {
-            "company_id": c.company_id,
-            "name": c.name,
-            "description": c.description,
-            "city": c.city,
-            "state": c.state,
-            "company_size": c.company_size,
-            "employee_count": c.employee_count,
-            "follower_count": c.follower_count,
-            "url": c.url
-        }
-        for c in companies
-    ]
+    return ORJSONResponse([dict(c) for c in companies])
 
 @app.get("/api/companies/search")
 def search_companies(
@@ -273,25 +313,27 @@ def search_companies(
 ):
     """Search companies"""
     
-    companies_query = db.query(Company)
+    companies_query = select(
+        Company.company_id, Company.name, Company.city, Company.state,
+        Company.company_size, Company.employee_count
+    )
     
     if query:
-        companies_query = companies_query.filter(
+        companies_query = companies_query.where(
             Company.name.ilike(f"%{query}%")
         )
     
-    total = companies_query.count()
-    companies = companies_query.offset(offset).limit(limit).all()
+    companies, total = fetch_page(db, companies_query, offset, limit)
     
     return {
         "total": total,
         "results": [
             {
-                "company_id": c.company_id,
-                "name": c.name,
-                "location": f"{c.city}, {c.state}" if c.city and c.state else c.state,
-                "company_size": c.company_size,
-                "employee_count": c.employee_count
+                "company_id": c['company_id'],
+                "name": c['name'],
+                "location": f"{c['city']}, {c['state']}" if c['city'] and c['state'] else c['state'],
+                "company_size": c['company_size'],
+                "employee_count": c['employee_count']
             }
             for c in companies
         ]
@@ -301,25 +343,27 @@ def search_companies(
 def get_top_hiring_companies(limit: int = 20, db: Session = Depends(get_db)):
     """Get companies with most job postings"""
     
-    results = db.query(
-        Company.name,
-        Company.company_id,
-        Company.city,
-        Company.state,
-        func.count(Job.id).label('job_count')
-    ).join(Job, Company.id == Job.company_id)\
-     .group_by(Company.id)\
-     .order_by(desc('job_count'))\
-     .limit(limit).all()
+    results = db.execute(
+        select(
+            Company.name,
+            Company.company_id,
+            Company.city,
+            Company.state,
+            func.count(Job.id).label('job_count')
+        ).join(Job, Company.company_id == Job.company_id)
+        .group_by(Company.id)
+        .order_by(desc('job_count'))
+        .limit(limit)
+    ).all()
     
     return [
         {
-            "name": r.name,
-            "company_id": r.company_id,
-            "location": f"{r.city}, {r.state}" if r.city else r.state,
-            "job_count": r.job_count
+            "name": name,
+            "company_id": company_id,
+            "location": f"{city}, {state}" if city else state,
+            "job_count": job_count
         }
-        for r in results
+        for name, company_id, city, state, job_count in results
     ]
 
 @app.get("/api/companies/{company_id}")
@@ -331,7 +375,7 @@ def get_company_detail(company_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Company not found")
     
     # Get jobs for this company
-    jobs = db.query(Job).filter(Job.company_id == company.id).limit(10).all()
+    jobs = db.query(Job).filter(Job.company_id == company.company_id).limit(10).all()
     
     return {
         "company_id": company.company_id,
@@ -363,71 +407,74 @@ def get_company_detail(company_id: str, db: Session = Depends(get_db)):
 # ============================================
 
 @app.get("/api/analytics/overview")
-def get_analytics_overview(db: Session = Depends(get_db)):
+@memoize(ttl=300)
+async def get_analytics_overview(db: AsyncSession = Depends(get_async_db)):
     """Get dashboard overview statistics"""
     
-    total_jobs = db.query(func.count(Job.id)).filter(Job.is_active == True).scalar()
-    total_companies = db.query(func.count(Company.id)).scalar()
-    total_skills = db.query(func.count(Skill.id)).scalar()
-    
-    avg_salary = db.query(func.avg(Salary.med_salary)).filter(
-        Salary.med_salary.isnot(None)
-    ).scalar()
+    # All four aggregates as scalar subqueries of one SELECT - a single round trip
+    total_jobs, total_companies, total_skills, avg_salary = (await db.execute(select(
+        select(func.count(Job.id)).where(Job.is_active == True).scalar_subquery(),
+        select(func.count(Company.id)).scalar_subquery(),
+        select(func.count(Skill.id)).scalar_subquery(),
+        select(func.round(func.avg(Salary.med_salary), 2))
+        .where(Salary.med_salary.isnot(None)).scalar_subquery()
+    ))).one()
     
     return {
         "total_jobs": total_jobs,
         "total_companies": total_companies,
         "total_skills": total_skills,
-        "average_salary": round(avg_salary, 2) if avg_salary else None
+        "average_salary": avg_salary or None
     }
 
 @app.get("/api/hotness/top-skills")
-def get_hotness_skills(limit: int = 20, db: Session = Depends(get_db)):
-    """Get skills with hotness scores"""
-    
-    # Count and calculate hotness
-    results = db.query(
-        Skill.skill_name,
-        func.count(JobSkill.id).label('count')
-    ).join(JobSkill).group_by(Skill.id).order_by(desc('count')).limit(limit).all()
-    
-    # Calculate hotness score (simple version for demo)
-    max_count = results[0].count if results else 1
+@memoize(ttl=300)
+async def get_hotness_skills(db: AsyncSession = Depends(get_async_db), limit: int = 20):
+    """Get skills with hotness scores (precomputed in skill_trends)"""
+    
+    # Rows come back already shaped (and rounded) by SQL - no per-field Python work
+    latest_month = select(func.max(SkillTrend.month)).scalar_subquery()
+    results = (await db.execute(
+        select(
+            SkillTrend.skill_name.label('skill'),
+            SkillTrend.job_count.label('count'),
+            func.round(SkillTrend.hotness_score, 1).label('hotness'),
+            func.round(SkillTrend.growth_rate, 1).label('growth_rate')
+        )
+        .where(SkillTrend.month == latest_month, SkillTrend.job_count > 0)
+        .order_by(SkillTrend.hotness_score.desc()).limit(limit)
+    )).mappings().all()
     
-    return [
-        {
-            "skill": r.skill_name,
-            "count": r.count,
-            "hotness": round((r.count / max_count) * 100, 1),
-            "growth_rate": round(15 + (r.count / max_count) * 20, 1)  # Mock growth
-        }
-        for r in results
-    ]
+    return [dict(r) for r in results]
 
 @app.get("/api/hotness/top-occupations")
-def get_hotness_occupations(limit: int = 10, db: Session = Depends(get_db)):
+@memoize(ttl=300)
+async def get_hotness_occupations(db: AsyncSession = Depends(get_async_db), limit: int = 10):
     """Get occupations with hotness scores"""
     
-    # Group by job title (simplified occupation)
-    results = db.query(
-        Job.title,
-        func.count(Job.id).label('count')
-    ).filter(Job.is_active == True)\
-     .group_by(Job.title)\
-     .order_by(desc('count'))\
-     .limit(limit).all()
+    # Job title as a simplified occupation - counts precomputed at ETL/startup
+    results = (await db.execute(
+        select(OccupationCount.title, OccupationCount.job_count)
+        .order_by(OccupationCount.job_count.desc())
+        .limit(limit)
+    )).all()
     
-    max_count = results[0].count if results else 1
+    # Scores relative to the top occupation, computed over the whole column at once
+    counts = np.fromiter((count for _, count in results), dtype=np.int64, count=len(results))
+    ratio = counts / (counts[0] if len(counts) else 1)
+    hotness = np.round(ratio * 100, 1).tolist()
+    growth = np.round(10 + ratio * 25, 1).tolist()
+    skill_gap = np.round(30 + ratio * 40, 1).tolist()
     
     return [
         {
-            "occupation": r.title,
-            "count": r.count,
-            "hotness": round((r.count / max_count) * 100, 1),
-            "growth_rate": round(10 + (r.count / max_count) * 25, 1),
-            "skill_gap": round(30 + (r.count / max_count) * 40, 1)
+            "occupation": title,
+            "count": count,
+            "hotness": hotness[i],
+            "growth_rate": growth[i],
+            "skill_gap": skill_gap[i]
         }
-        for r in results
+        for i, (title, count) in enumerate(results)
     ]
 
 # ============================================
@@ -435,22 +482,23 @@ def get_hotness_occupations(limit: int = 10, db: Session = Depends(get_db)):
 # ============================================
 
 @app.get("/api/benefits/top")
-def get_top_benefits(limit: int = 20, db: Session = Depends(get_db)):
+@memoize(ttl=300)
+async def get_top_benefits(db: AsyncSession = Depends(get_async_db), limit: int = 20):
     """Get most common benefits"""
     
-    results = db.query(
-        Benefit.type,
-        func.count(Benefit.id).label('count')
-    ).group_by(Benefit.type)\
-     .order_by(desc('count'))\
-     .limit(limit).all()
+    results = (await db.execute(
+        select(Benefit.type, func.count(Benefit.id).label('count'))
+        .group_by(Benefit.type)
+        .order_by(desc('count'))
+        .limit(limit)
+    )).all()
     
     return [
         {
-            "benefit": r.type,
-            "count": r.count
+            "benefit": benefit_type,
+            "count": count
         }
-        for r in results
+        for benefit_type, count in results
     ]
 
 # ============================================
@@ -458,23 +506,28 @@ def get_top_benefits(limit: int = 20, db: Session = Depends(get_db)):
 # ============================================
 
 @app.get("/api/forecast/skill/{skill_name}")
-def forecast_skill(
+async def forecast_skill(
     skill_name: str,
     periods: int = Query(6, ge=1, le=24),
     db: Session = Depends(get_db)
 ):
     """Forecast demand for a specific skill"""
-    return quick_forecast(db, skill_name, periods)
+    # A skill_lookup cache miss queries the skills table - keep it off the event loop
+    loop = asyncio.get_running_loop()
+    skill_name = await loop.run_in_executor(None, resolve_skill, db, skill_name)
+    return await quick_forecast_async(db, skill_name, periods)
 
 @app.get("/api/forecast/top-skills")
-def forecast_top_skills(
+async def forecast_top_skills(
     limit: int = Query(10, le=20),
     periods: int = Query(6, ge=1, le=12),
     db: Session = Depends(get_db)
 ):
     """Forecast demand for top skills"""
     forecaster = get_forecaster(db)
-    return forecaster.forecast_top_skills(limit, periods)
+    # Waits on the worker pool's fits from a thread, off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, forecaster.forecast_top_skills, limit, periods)
 
 @app.get("/api/forecast/trending")
 def get_trending_skills_forecast(
@@ -497,15 +550,10 @@ def get_hottest_skills_advanced(
 @app.get("/api/hotness/skill/{skill_name}")
 def get_skill_hotness(skill_name: str, db: Session = Depends(get_db)):
     """Get hotness score for specific skill"""
+    skill_name = resolve_skill(db, skill_name)
     forecaster = get_forecaster(db)
     
-    hotness = forecaster.calculate_hotness_score(skill_name)
-    growth = forecaster.calculate_growth_rate(skill_name)
-    
-    # Get job count
-    job_count = db.query(func.count(JobSkill.id))\
-        .join(Skill)\
-        .filter(Skill.skill_name == skill_name).scalar() or 0
+    job_count, growth, hotness = forecaster.skill_scores(skill_name)
     
     return {
         "skill": skill_name,
@@ -523,7 +571,7 @@ def forecast_salary(
 ):
     """Forecast salary trends for a skill"""
     forecaster = get_forecaster(db)
-    return forecaster.predict_salary_trend(skill_name, periods)
+    return forecaster.predict_salary_trend(resolve_skill(db, skill_name), periods)
 
 # ============================================
 # ADVANCED ANALYTICS ENDPOINTS
@@ -551,7 +599,7 @@ def get_location_insights_endpoint(
 ):
     """Get job market insights by location (states)"""
     analytics = get_analytics(db)
-    return analytics.get_location_insights(limit)
+    return ORJSONResponse(analytics.get_location_insights(limit))
 
 @app.get("/api/analytics/cities")
 def get_city_rankings_endpoint(
@@ -568,8 +616,9 @@ def get_skill_network_endpoint(
     db: Session = Depends(get_db)
 ):
     """Get skill relationship network for visualization"""
+    # Returned directly so the (possibly large) edge list skips jsonable_encoder
     analytics = get_analytics(db)
-    return analytics.get_skill_network(min_co_occurrence)
+    return ORJSONResponse(analytics.get_skill_network(min_co_occurrence))
 
 @app.get("/api/analytics/skill-co-occurrence/{skill_name}")
 def get_skill_co_occurrence_endpoint(
@@ -579,7 +628,7 @@ def get_skill_co_occurrence_endpoint(
 ):
     """Get skills that commonly appear with given skill"""
     analytics = get_analytics(db)
-    return analytics.get_skill_co_occurrence(skill_name, limit)
+    return analytics.get_skill_co_occurrence(resolve_skill(db, skill_name), limit)
 
 @app.get("/api/analytics/benefits")
 def get_benefits_analysis_endpoint(db: Session = Depends(get_db)):
@@ -604,7 +653,7 @@ def get_salary_distribution_endpoint(
 ):
     """Get salary distribution (histogram)"""
     analytics = get_analytics(db)
-    return analytics.get_salary_distribution(skill, bins)
+    return ORJSONResponse(analytics.get_salary_distribution(skill, bins))
 
 @app.post("/api/analytics/compare-skills")
 def compare_skills_endpoint(
@@ -626,4 +675,6 @@ if __name__ == "__main__":
     print("[INFO] Starting Job Forecaster API...")
     print("[INFO] Server: http://localhost:8000")
     print("[INFO] Docs: http://localhost:8000/docs")
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    prepare_database()  # Once, before any worker starts
+    workers = int(os.getenv("API_WORKERS", "1"))  # e.g. the number of cores in production
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=workers == 1, workers=workers)
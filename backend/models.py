@@ -1,20 +1,24 @@
 """
 Database Models
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index, text, func
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Partial index: active-job title counts (occupation_counts refresh) read only this
+        Index('ix_jobs_active_title', 'title', sqlite_where=text('is_active = 1')),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, unique=True, index=True)
     title = Column(String, index=True)
     description = Column(Text)
-    company_id = Column(Integer, ForeignKey("companies.id"))
-    location = Column(String)
+    company_id = Column(String, ForeignKey("companies.company_id"), index=True)
+    location = Column(String, index=True)
     city = Column(String)
     state = Column(String)
     country = Column(String)
@@ -27,6 +31,7 @@ class Job(Base):
     company = relationship("Company", back_populates="jobs")
     salaries = relationship("Salary", back_populates="job")
     job_skills = relationship("JobSkill", back_populates="job")
+    skills = relationship("Skill", secondary="job_skills", viewonly=True)
     benefits = relationship("Benefit", back_populates="job")
 
 
@@ -54,6 +59,12 @@ class Company(Base):
 
 class Salary(Base):
     __tablename__ = "salaries"
+    __table_args__ = (
+        # Covers the Job -> Salary join plus AVG(med_salary) without a table lookup
+        Index('ix_salaries_job_id_med_salary', 'job_id', 'med_salary'),
+        # Ordered med_salary: distribution buckets/min/max and the quantile OFFSET reads
+        Index('ix_salaries_med_salary', 'med_salary'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     salary_id = Column(String, unique=True, index=True)
@@ -74,18 +85,30 @@ class Skill(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     skill_abr = Column(String, unique=True, index=True)
-    skill_name = Column(String, index=True)
+    skill_name = Column(String, unique=True, index=True)
+    cached_job_count = Column(Integer, default=0, index=True)  # COUNT of job_skills rows, refreshed by ETL/startup
     
     # Relationships
     job_skills = relationship("JobSkill", back_populates="skill")
 
 
+# Case-insensitive skill name lookups
+Index('ix_skills_skill_name_lower', func.lower(Skill.skill_name))
+
+
 class JobSkill(Base):
     __tablename__ = "job_skills"
+    __table_args__ = (
+        Index('ix_job_skills_job_id_skill_abr', 'job_id', 'skill_abr', unique=True),
+        # Per-skill job counts/joins on the integer key without touching the table
+        Index('ix_job_skills_skill_id_job_id', 'skill_id', 'job_id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, ForeignKey("jobs.job_id"))
-    skill_abr = Column(String, ForeignKey("skills.skill_abr"))
+    skill_abr = Column(String)  # Code from the source CSV - joins go through skill_id
+    skill_id = Column(Integer, ForeignKey("skills.id"))  # Set from skill_abr by link_job_skill_ids
+    skill_name = Column(String, index=True)  # Denormalized from Skill so GROUP BYs skip the join
     
     # Relationships
     job = relationship("Job", back_populates="job_skills")
@@ -128,10 +151,13 @@ class CompanyIndustry(Base):
 
 class Benefit(Base):
     __tablename__ = "benefits"
+    __table_args__ = (
+        Index('ix_benefits_job_id_type', 'job_id', 'type', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(String, ForeignKey("jobs.job_id"))
-    type = Column(String)
+    type = Column(String, index=True)
     inferred = Column(Boolean, default=False)
     
     # Relationships
@@ -141,6 +167,11 @@ class Benefit(Base):
 # Analytics Tables for caching computed results
 class SkillTrend(Base):
     __tablename__ = "skill_trends"
+    __table_args__ = (
+        # One row per skill per month - target of recompute_skill_trends' upsert
+        Index('ix_skill_trends_skill_name_month', 'skill_name', 'month', unique=True),
+        Index('ix_skill_trends_month_hotness_score', 'month', 'hotness_score'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     skill_name = Column(String, index=True)
@@ -164,3 +195,25 @@ class OccupationTrend(Base):
     hotness_score = Column(Float)
     avg_salary = Column(Float, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SkillCooccurrence(Base):
+    """Precomputed at ETL time: number of jobs listing both skills (both orderings stored)"""
+    __tablename__ = "skill_cooccurrence"
+    __table_args__ = (
+        Index('ix_skill_cooccurrence_skill_a_job_count', 'skill_a', 'job_count'),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    skill_a = Column(String)
+    skill_b = Column(String)
+    job_count = Column(Integer)
+
+
+class OccupationCount(Base):
+    """Precomputed at ETL time: active jobs per title (stand-in for a materialized view)"""
+    __tablename__ = "occupation_counts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, unique=True)
+    job_count = Column(Integer, index=True)